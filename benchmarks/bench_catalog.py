@@ -0,0 +1,58 @@
+"""Compare loading a launch one file at a time to `load_runs` and `iter_rows`.
+
+Usage:
+    python benchmarks/bench_catalog.py --num-runs 20000
+"""
+import argparse
+import glob
+import os
+import tempfile
+import time
+from typing import List
+
+from pydantic import Field
+
+from pydrantic import BaseConfig, RunConfig
+from pydrantic.catalog import iter_rows, load_runs
+
+
+class LayerConfig(BaseConfig):
+    dim: int = 768
+    num_heads: int = 12
+    dropout: float = 0.1
+
+
+class TrainConfig(RunConfig):
+    lr: float = 1e-3
+    seed: int = 0
+    layers: List[LayerConfig] = Field(default_factory=lambda: [LayerConfig() for _ in range(4)])
+
+    def run(self):
+        pass
+
+
+def _timeit(name, fn):
+    start = time.perf_counter()
+    out = fn()
+    print(f"{name:>24}: {time.perf_counter() - start:0.3f}s")
+    return out
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-runs", type=int, default=20_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        for idx in range(args.num_runs):
+            run_dir = os.path.join(output_dir, "launch", str(idx))
+            os.makedirs(run_dir)
+            TrainConfig(lr=idx * 1e-6, seed=idx, run_dir=run_dir).to_yaml(
+                os.path.join(run_dir, "config.yaml")
+            )
+
+        paths = sorted(glob.glob(os.path.join(output_dir, "*", "*", "config.yaml")))
+        _timeit("from_yaml (serial)", lambda: [TrainConfig.from_yaml(p) for p in paths])
+        _timeit("load_runs (threads)", lambda: load_runs(output_dir))
+        _timeit("load_runs (processes)", lambda: load_runs(output_dir, executor="process"))
+        _timeit("iter_rows (processes)", lambda: list(iter_rows(output_dir, executor="process")))
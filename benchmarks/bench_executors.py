@@ -0,0 +1,62 @@
+"""Compare the overhead of the executor backends on the same sweep of short runs.
+
+Usage:
+    python benchmarks/bench_executors.py --num-configs 1000 --num-workers 8
+"""
+import argparse
+import time
+
+from pydrantic import RunConfig
+from pydrantic.executors import available_executors, get_executor
+
+
+class SleepConfig(RunConfig):
+    seconds: float = 0.0
+    work: int = 0
+
+    def run(self):
+        time.sleep(self.seconds)
+        return sum(range(self.work))
+
+
+def _run_all(executor, configs):
+    handles = [executor.submit(config) for config in configs]
+    while handles:
+        _, handles = executor.wait(handles)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-configs", type=int, default=1000)
+    parser.add_argument("--num-workers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=0.001, help="Time each run sleeps")
+    parser.add_argument("--work", type=int, default=10_000, help="CPU work done by each run")
+    parser.add_argument("--executors", nargs="+", default=None)
+    args = parser.parse_args()
+
+    configs = [SleepConfig(seconds=args.seconds, work=args.work) for _ in range(args.num_configs)]
+    backend_args = argparse.Namespace(
+        num_workers=args.num_workers, 
+        max_tasks_per_child=None, 
+        gpus_per_config=0, 
+        log_to_driver=False,
+        # the local executor schedules one config per cpu core
+        devices=None,
+        cpus_per_config=1,
+        memory_per_config=0.0,
+        num_cpus=args.num_workers,
+        memory=None,
+    )
+    print(f"configs: {len(configs)} | workers: {args.num_workers}")
+    for name in args.executors or available_executors():
+        start = time.perf_counter()
+        try:
+            executor = get_executor(name).from_args(backend_args)
+        except ImportError as e:
+            print(f"{name:>8}: skipped ({e})")
+            continue
+        startup = time.perf_counter() - start
+        _run_all(executor, configs)
+        executor.shutdown()
+        total = time.perf_counter() - start
+        print(f"{name:>8}: {total:0.3f}s (startup: {startup:0.3f}s)")
@@ -0,0 +1,61 @@
+"""Compare saving and loading configs as yaml, json and msgpack.
+
+Usage:
+    python benchmarks/bench_formats.py --num-configs 1000
+"""
+import argparse
+import os
+import tempfile
+import time
+from typing import List
+
+from pydantic import Field
+
+from pydrantic import BaseConfig
+
+
+class LayerConfig(BaseConfig):
+    dim: int = 768
+    num_heads: int = 12
+    dropout: float = 0.1
+    activation: str = "gelu"
+
+
+class TrainConfig(BaseConfig):
+    lr: float = 1e-3
+    betas: tuple = (0.9, 0.999)
+    name: str = "run"
+    layers: List[LayerConfig] = Field(default_factory=lambda: [LayerConfig() for _ in range(12)])
+
+
+def _bench(configs, directory, fmt):
+    paths = [os.path.join(directory, f"{idx}.{fmt}") for idx in range(len(configs))]
+    start = time.perf_counter()
+    for config, path in zip(configs, paths):
+        getattr(config, f"to_{fmt}")(path)
+    save = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for path in paths:
+        getattr(TrainConfig, f"from_{fmt}")(path)
+    load = time.perf_counter() - start
+    return save, load
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-configs", type=int, default=1000)
+    args = parser.parse_args()
+
+    configs = [TrainConfig(lr=idx * 1e-5, name=f"run-{idx}") for idx in range(args.num_configs)]
+    formats = ["yaml", "json"]
+    try:
+        import msgpack
+        formats.append("msgpack")
+    except ImportError:
+        pass
+
+    with tempfile.TemporaryDirectory() as directory:
+        for fmt in formats:
+            save, load = _bench(configs, directory, fmt)
+            print(f"{fmt:>8}: save {save:0.3f}s, load {load:0.3f}s")
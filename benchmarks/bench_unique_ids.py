@@ -0,0 +1,90 @@
+"""Compare `get_unique_ids` to the previous implementation, which scanned every
+config once per key.
+
+Usage:
+    python benchmarks/bench_unique_ids.py --num-configs 100000
+"""
+import argparse
+import time
+
+from pydantic import Field
+
+from pydrantic import BaseConfig
+from pydrantic.config import get_unique_ids
+from pydrantic.utils import flatten_dict
+
+
+class OptimizerConfig(BaseConfig):
+    lr: float = 1e-3
+    weight_decay: float = 0.0
+    betas: tuple = (0.9, 0.999)
+
+
+class ModelConfig(BaseConfig):
+    num_layers: int = 12
+    hidden_dim: int = 768
+    num_heads: int = 12
+    dropout: float = 0.1
+
+
+class TrainConfig(BaseConfig):
+    seed: int = 0
+    epochs: int = 10
+    batch_size: int = 128
+    optimizer: OptimizerConfig = Field(default_factory=OptimizerConfig)
+    model: ModelConfig = Field(default_factory=ModelConfig)
+
+
+def _legacy_get_unique_ids(configs, exclude=[], sep="."):
+    flattened_configs = [flatten_dict(config.to_dict(), sep=sep) for config in configs]
+
+    differing_keys = set()
+    all_keys = set([key for config in flattened_configs for key in config.keys()])
+    for key in all_keys:
+        if key in exclude:
+            continue
+        values = set()
+        for config in flattened_configs:
+            if key in config:
+                values.add(config[key])
+        if len(values) > 1:
+            differing_keys.add(key)
+
+    unique_ids = []
+    for config in flattened_configs:
+        id_parts = [
+            f"{key.split('.')[-1]}={config[key]}" 
+            for key in differing_keys 
+            if key in config
+        ]
+        unique_ids.append('-'.join(id_parts))
+    return unique_ids
+
+
+def _timeit(fn):
+    start = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - start, out
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-configs", type=int, default=100_000)
+    args = parser.parse_args()
+
+    configs = [
+        TrainConfig(
+            seed=idx % 5,
+            optimizer=OptimizerConfig(lr=10 ** -(idx % 4 + 2)),
+            model=ModelConfig(num_layers=(idx // 20) % 10 + 1),
+        )
+        for idx in range(args.num_configs)
+    ]
+
+    legacy, legacy_ids = _timeit(lambda: _legacy_get_unique_ids(configs))
+    columnar, ids = _timeit(lambda: get_unique_ids(configs))
+    # the legacy implementation orders the parts of each id by set iteration order
+    assert [sorted(i.split("-")) for i in ids] == [sorted(i.split("-")) for i in legacy_ids]
+    print(f"configs: {len(configs)}")
+    print(f"legacy:   {legacy:0.3f}s")
+    print(f"columnar: {columnar:0.3f}s ({legacy / columnar:0.1f}x)")
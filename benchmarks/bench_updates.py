@@ -0,0 +1,92 @@
+"""Compare the batched override engine to the previous per-config update loop.
+
+Usage:
+    python benchmarks/bench_updates.py --num-configs 10000
+"""
+import argparse
+import time
+
+from pydantic import Field
+
+from pydrantic import BaseConfig, RunConfig
+from pydrantic.cli import _update_configs
+from pydrantic.variables import FormatStringVariable
+
+
+class LayerConfig(BaseConfig):
+    hidden_dim: int = 1024
+    dropout: float = 0.1
+
+
+class ModelConfig(BaseConfig):
+    num_layers: int = 12
+    layer: LayerConfig = Field(default_factory=LayerConfig)
+
+
+class TrainConfig(RunConfig):
+    lr: float = 1e-3
+    epochs: int = 10
+    batch_size: int = 128
+    name: str = "run"
+    model: ModelConfig = Field(default_factory=ModelConfig)
+
+    def run(self):
+        pass
+
+
+def _legacy_update_config(config: BaseConfig, updates):
+    # the update loop before batching: every update revalidates all of its ancestors
+    for update in updates:
+        arg_path, value = update.split("=")
+
+        child, parent = config, None
+        ancestors = []
+        for key in arg_path.split("."):
+            next_node = getattr(child, key)
+            if isinstance(next_node, BaseConfig):
+                parent = child
+                child = next_node
+                ancestors.append((parent, key))
+
+        data = {**{k: getattr(child, k) for k in type(child).model_fields}, key: value}
+        if child._variables is not None:
+            data.update(child._variables)
+        config = child.model_validate(data, strict=False)
+
+        for (parent, key) in reversed(ancestors):
+            data = {**{k: getattr(parent, k) for k in type(parent).model_fields}, key: config}
+            if parent._variables is not None:
+                data.update(parent._variables)
+            config = parent.model_validate(data, strict=False)
+    return config
+
+
+def _timeit(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-configs", type=int, default=10_000)
+    args = parser.parse_args()
+
+    model = ModelConfig()
+    configs = [
+        TrainConfig(lr=lr, name=FormatStringVariable("lr={lr}"), model=model)
+        for lr in [1e-4 * (i + 1) for i in range(args.num_configs)]
+    ]
+    updates = [
+        "epochs=20",
+        "batch_size=256",
+        "model.num_layers=24",
+        "model.layer.hidden_dim=2048",
+        "model.layer.dropout=0.0",
+    ]
+
+    legacy = _timeit(lambda: [_legacy_update_config(c, updates) for c in configs])
+    batched = _timeit(lambda: _update_configs(configs, updates))
+    print(f"configs: {len(configs)} | updates: {len(updates)}")
+    print(f"per-config loop: {legacy:0.3f}s")
+    print(f"batched:         {batched:0.3f}s ({legacy / batched:0.1f}x)")
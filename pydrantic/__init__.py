@@ -1,12 +1,79 @@
-from pydrantic.cli import main #, apply_overrides, Alias
-from pydrantic.config import BaseConfig, RunConfig, ObjectConfig
-from pydrantic.types import FormatStr
-from pydrantic.utils import (
-    load_dill,
-    load_pickle,
-    load_yaml,
-    load_binary,
-    save_dill,
-    save_pickle,
-    save_yaml,
-)
+from typing import TYPE_CHECKING
+
+# the public names and the modules they live in. They are imported on first access
+# (PEP 562), so that `import pydrantic` (e.g. in every worker process) doesn't import
+# pydantic, yaml or the executors until they are used.
+_EXPORTS = {
+    "main": "pydrantic.cli",
+    "launch": "pydrantic.cli",
+    "Launch": "pydrantic.cli",
+    "RunResult": "pydrantic.executors",
+    "BaseConfig": "pydrantic.config",
+    "RunConfig": "pydrantic.config",
+    "ObjectConfig": "pydrantic.config",
+    "load_runs": "pydrantic.catalog",
+    "iter_rows": "pydrantic.catalog",
+    "to_columns": "pydrantic.columns",
+    "Columns": "pydrantic.columns",
+    "OverridePlan": "pydrantic.overrides",
+    "Sweep": "pydrantic.sweep",
+    "Uniform": "pydrantic.sweep",
+    "LogUniform": "pydrantic.sweep",
+    "Choice": "pydrantic.sweep",
+    "logspace": "pydrantic.sweep",
+    "linspace": "pydrantic.sweep",
+    "FormatStr": "pydrantic.types",
+    "load_dill": "pydrantic.utils",
+    "load_pickle": "pydrantic.utils",
+    "load_yaml": "pydrantic.utils",
+    "load_json": "pydrantic.utils",
+    "load_msgpack": "pydrantic.utils",
+    "load_binary": "pydrantic.utils",
+    "save_dill": "pydrantic.utils",
+    "save_pickle": "pydrantic.utils",
+    "save_yaml": "pydrantic.utils",
+    "save_json": "pydrantic.utils",
+    "save_msgpack": "pydrantic.utils",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+
+    value = getattr(importlib.import_module(module_name), name)
+    # later lookups don't go through `__getattr__`
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from pydrantic.cli import main, launch, Launch #, apply_overrides, Alias
+    from pydrantic.executors import RunResult
+    from pydrantic.config import BaseConfig, RunConfig, ObjectConfig
+    from pydrantic.catalog import load_runs, iter_rows
+    from pydrantic.columns import to_columns, Columns
+    from pydrantic.overrides import OverridePlan
+    from pydrantic.sweep import Sweep, Uniform, LogUniform, Choice, logspace, linspace
+    from pydrantic.types import FormatStr
+    from pydrantic.utils import (
+        load_dill,
+        load_pickle,
+        load_yaml,
+        load_json,
+        load_msgpack,
+        load_binary,
+        save_dill,
+        save_pickle,
+        save_yaml,
+        save_json,
+        save_msgpack,
+    )
@@ -0,0 +1,84 @@
+import os
+import pickle
+from abc import ABC, abstractmethod
+from typing import Any, Optional, Tuple
+
+
+class ResultCache(ABC):
+    """Interface for stores of run outputs, keyed by the fingerprint of the config
+    that produced them (see `BaseConfig.fingerprint`)."""
+
+    @abstractmethod
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Returns `(True, output)` on a hit and `(False, None)` on a miss."""
+        pass
+
+    @abstractmethod
+    def set(self, key: str, output: Any):
+        pass
+
+
+class DiskCache(ResultCache):
+    """Stores pickled outputs in a local directory, evicting the least recently used
+    entries once the cache is larger than `max_size` bytes.
+
+    Parameters:
+        path (str): The directory to store outputs in.
+        max_size (int): The maximum total size of the cache in bytes. Defaults to
+            no limit.
+    """
+
+    def __init__(self, path: str, max_size: Optional[int] = None):
+        self.path = path
+        self.max_size = max_size
+        os.makedirs(path, exist_ok=True)
+        self._size = sum(os.path.getsize(p) for p, _ in self._entries())
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.path, key[:2], f"{key}.pkl")
+
+    def _entries(self):
+        for root, _, files in os.walk(self.path):
+            for name in files:
+                if name.endswith(".pkl"):
+                    path = os.path.join(root, name)
+                    yield path, os.path.getmtime(path)
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        path = self._entry_path(key)
+        try:
+            with open(path, "rb") as f:
+                output = pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return False, None
+        # we use the modification time to track when an entry was last used
+        os.utime(path)
+        return True, output
+
+    def set(self, key: str, output: Any):
+        try:
+            data = pickle.dumps(output)
+        except Exception as e:
+            print(f"Not caching output of type {type(output).__name__}: {e}")
+            return
+        path = self._entry_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if os.path.exists(path):
+            self._size -= os.path.getsize(path)
+        # write to a temporary file first so that readers never see a partial entry
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        self._size += len(data)
+        self._evict()
+
+    def _evict(self):
+        if self.max_size is None or self._size <= self.max_size:
+            return
+        for path, _ in sorted(self._entries(), key=lambda entry: entry[1]):
+            if self._size <= self.max_size:
+                break
+            size = os.path.getsize(path)
+            os.remove(path)
+            self._size -= size
@@ -0,0 +1,172 @@
+import os
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from pydrantic.config import BaseConfig
+from pydrantic.resume import read_status
+from pydrantic.utils import flatten_dict, load_json, load_msgpack, load_yaml
+
+
+# the files a config may be saved to in its run_dir, in order of preference
+CONFIG_FILES = ("config.json", "config.msgpack", "config.yaml")
+
+
+@dataclass
+class Run:
+    """A run loaded from an output directory.
+
+    Attributes:
+        run_dir (str): The directory the run was found in.
+        config (BaseConfig): The config of the run, or None if it could not be loaded.
+        row (Dict[str, Any]): The flattened config, along with the `_run_dir`,
+            `_status` and `_wall_time` of the run.
+        error (Exception): The error raised while loading the run, if any.
+    """
+    run_dir: str
+    config: Optional[BaseConfig] = None
+    row: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[Exception] = None
+
+
+def _config_path(run_dir: str) -> Optional[str]:
+    for name in CONFIG_FILES:
+        path = os.path.join(run_dir, name)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def _load_data(path: str) -> Dict:
+    if path.endswith(".json"):
+        return load_json(path)
+    elif path.endswith(".msgpack"):
+        return load_msgpack(path)
+    return load_yaml(path)
+
+
+def find_runs(output_dir: str, launch_id: Optional[str] = None) -> List[str]:
+    """The run directories (`output_dir/launch_id/run_id`) that contain a config,
+    optionally only those of one launch."""
+    if launch_id is not None:
+        launch_dirs = [os.path.join(output_dir, launch_id)]
+    elif os.path.isdir(output_dir):
+        launch_dirs = sorted(e.path for e in os.scandir(output_dir) if e.is_dir())
+    else:
+        launch_dirs = []
+
+    run_dirs = []
+    for launch_dir in launch_dirs:
+        if not os.path.isdir(launch_dir):
+            continue
+        for entry in sorted(os.scandir(launch_dir), key=lambda e: e.name):
+            if entry.is_dir() and _config_path(entry.path) is not None:
+                run_dirs.append(entry.path)
+    return run_dirs
+
+
+def _row(run_dir: str, data: Dict, sep: str) -> Dict[str, Any]:
+    row = flatten_dict(data, sep=sep)
+    status = read_status(run_dir) or {}
+    row["_run_dir"] = run_dir
+    row["_status"] = status.get("status")
+    row["_wall_time"] = status.get("wall_time")
+    return row
+
+
+def _read_row(run_dir: str, sep: str) -> Dict[str, Any]:
+    try:
+        return _row(run_dir, _load_data(_config_path(run_dir)), sep)
+    except Exception as e:
+        return {"_run_dir": run_dir, "_error": repr(e)}
+
+
+def _read_run(run_dir: str, sep: str, strict: bool) -> Run:
+    try:
+        data = _load_data(_config_path(run_dir))
+        config = BaseConfig.from_dict(data, strict=strict)
+    except Exception as e:
+        return Run(run_dir=run_dir, error=e)
+    return Run(run_dir=run_dir, config=config, row=_row(run_dir, data, sep))
+
+
+def _map(fn: Callable, items: List[Any], num_workers: int, executor: str) -> Iterator[Any]:
+    """Maps `fn` over `items` in a thread or process pool, yielding results in order."""
+    if num_workers <= 1 or len(items) <= 1:
+        yield from map(fn, items)
+        return
+
+    if executor == "thread":
+        from concurrent.futures import ThreadPoolExecutor as PoolExecutor
+    elif executor == "process":
+        from concurrent.futures import ProcessPoolExecutor as PoolExecutor
+    else:
+        raise ValueError(f"Unknown executor `{executor}`, expected 'thread' or 'process'.")
+
+    # with processes, we send the items in chunks to amortize the round trips
+    chunksize = max(1, min(256, len(items) // (4 * num_workers))) if executor == "process" else 1
+    with PoolExecutor(max_workers=num_workers) as pool:
+        yield from pool.map(fn, items, chunksize=chunksize)
+
+
+def _default_num_workers() -> int:
+    return min(32, os.cpu_count() or 1)
+
+
+def iter_rows(
+    output_dir: str,
+    launch_id: Optional[str] = None,
+    num_workers: Optional[int] = None,
+    executor: str = "thread",
+    sep: str = ".",
+) -> Iterator[Dict[str, Any]]:
+    """Streams a flattened row for each run in `output_dir`, without building the
+    configs. This skips importing the config classes and validating the configs, so
+    it is much faster than `load_runs` when only the values are needed.
+
+    Rows of runs that could not be read have only `_run_dir` and `_error`.
+
+    Parameters:
+        output_dir (str): The output directory of the launches.
+        launch_id (str): Optionally, only read the runs of this launch.
+        num_workers (int): The number of threads or processes reading files. Defaults
+            to the number of cpus. Use 0 to read files in the calling thread.
+        executor (str): Read files in a "thread" or "process" pool. Parsing yaml holds
+            the GIL, so processes are faster for large launches, but they must be able
+            to import the config classes (e.g. not ones defined in a notebook).
+        sep (str): The separator of the keys in the rows.
+    """
+    run_dirs = find_runs(output_dir, launch_id)
+    num_workers = _default_num_workers() if num_workers is None else num_workers
+    yield from _map(partial(_read_row, sep=sep), run_dirs, num_workers, executor)
+
+
+def load_runs(
+    output_dir: str,
+    launch_id: Optional[str] = None,
+    num_workers: Optional[int] = None,
+    executor: str = "thread",
+    strict: bool = False,
+    sep: str = ".",
+) -> List[Run]:
+    """Loads the config and flattened row of each run in `output_dir`, e.g. to
+    analyze a sweep.
+
+    Example:
+        runs = load_runs("outputs", launch_id="2024-01-01-12-00-00-train")
+        df = pd.DataFrame([run.row for run in runs if run.error is None])
+
+    Parameters:
+        output_dir (str): The output directory of the launches.
+        launch_id (str): Optionally, only load the runs of this launch.
+        num_workers (int): The number of threads or processes loading runs. Defaults
+            to the number of cpus. Use 0 to load runs in the calling thread.
+        executor (str): Load runs in a "thread" or "process" pool.
+        strict (bool): Whether to fail on configs with fields that no longer exist
+            (see `BaseConfig.from_dict`). Runs that fail to load have an `error`.
+        sep (str): The separator of the keys in the rows.
+    """
+    run_dirs = find_runs(output_dir, launch_id)
+    num_workers = _default_num_workers() if num_workers is None else num_workers
+    fn = partial(_read_run, sep=sep, strict=strict)
+    return list(_map(fn, run_dirs, num_workers, executor))
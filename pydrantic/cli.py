@@ -1,135 +1,480 @@
 import os
+import time
+from collections import defaultdict
 from pathlib import Path
 from datetime import datetime
 from dataclasses import dataclass
-from typing import Union, List
+from typing import Dict, Iterable, Iterator, List, Optional, Sized, Tuple, Union
 
+from pydrantic.cache import DiskCache, ResultCache
 from pydrantic.config import BaseConfig, RunConfig
+from pydrantic.executors import Executor, RunResult, SerialExecutor, execute_config, get_executor
+from pydrantic.overrides import OverridePlan
+from pydrantic.resume import completed_fingerprints, latest_launch_id, write_status
 
 
-def execute_config(config: RunConfig):
-    # os.makedirs(config.run_dir, exist_ok=True)
-    try: 
-        output = config.run()
-    except Exception as e:
-        return None, config, e
-    return output, config, None
+def _update_configs(configs: List[BaseConfig], updates: List[str]) -> List[BaseConfig]:
+    """Apply the same cli updates to every config in a sweep. 
+
+    The updates are compiled once into an `OverridePlan` and each config is 
+    revalidated only along the paths touched by the updates.
+    """
+    if len(updates) == 0 or len(configs) == 0:
+        return list(configs)
+    plan = OverridePlan.from_updates(updates, type(configs[0]))
+    return plan.apply_many(configs)
 
 
 def _update_config(config: BaseConfig, updates: List[str]) -> BaseConfig:
-    # perform nested updates in place
-    for update in updates:
-        arg_path, value = update.split("=")
-
-        child, parent, relation = config, None, None
-        ancestors = []
-        for key in arg_path.split("."):
-            next_node = getattr(child, key)
-            if isinstance(next_node, BaseConfig):
-                parent = child
-                child = next_node
-                ancestors.append((parent, key))
-
-        # NOTE: we use strict=False so that it coerces the strings from the cli into the 
-        # correct types
-        # we also are careful not to use model_dump() because it will also serialize
-        # the nested configs
-        data = {**{k: getattr(child, k) for k in child.model_fields}, key: value}
-        if child._variables is not None:
-            data.update(child._variables)
-        config = child.model_validate(data, strict=False)
+    return _update_configs([config], updates)[0]
+
+
+def _write_config(config: RunConfig) -> float:
+    start = time.perf_counter()
+    os.makedirs(config.run_dir, exist_ok=True)
+    config.to_yaml(os.path.join(config.run_dir, "config.yaml"))
+    return time.perf_counter() - start
+
+
+def _write_configs(
+    configs: Iterable[RunConfig], 
+    num_workers: int,
+    timings: Dict[str, float],
+) -> Iterator[RunConfig]:
+    """Creates the run_dir of each config with an output_dir and writes its 
+    config.yaml, yielding the configs in order once they are written. With 
+    `num_workers > 0`, the writes are spread over a thread pool with at most 
+    `2 * num_workers` pending writes."""
+    if num_workers <= 0:
+        for config in configs:
+            if config.output_dir is not None:
+                timings["write"] += _write_config(config)
+            yield config
+        return
+
+    from collections import deque
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=num_workers) as pool:
+        pending = deque()
+
+        def _pop():
+            config, future = pending.popleft()
+            if future is not None:
+                timings["write"] += future.result()
+            return config
+
+        for config in configs:
+            future = pool.submit(_write_config, config) if config.output_dir is not None else None
+            pending.append((config, future))
+            while len(pending) >= 2 * num_workers:
+                yield _pop()
+        while pending:
+            yield _pop()
+
+
+def _prepare_configs(
+    configs: Iterable[RunConfig], 
+    updates: List[str], 
+    time_tag: str,
+    timings: Dict[str, float],
+    hashes: Dict[str, str],
+    resume: Optional[str] = None,
+) -> Iterator[RunConfig]:
+    """Lazily applies the cli updates to each config and assigns its ids. Configs 
+    are yielded as soon as they are ready so that they can be launched before the 
+    rest of the sweep is prepared. 
     
-        for (parent, key) in reversed(ancestors):
-            data = {** {k: getattr(parent, k) for k in parent.model_fields}, key: config}
-            if parent._variables is not None:
-                data.update(parent._variables)
-            config = parent.model_validate(data, strict=False)
+    The fingerprint of each config with an output_dir is recorded in `hashes`, by 
+    run_dir. If `resume` is a launch_id (or "latest"), configs are assigned to that 
+    launch instead of a new one.
+    """
+    if isinstance(configs, list):
+        # for materialized sweeps we can share revalidated subconfigs between configs
+        start = time.perf_counter()
+        configs = _update_configs(configs, updates)
+        timings["update"] += time.perf_counter() - start
+    elif len(updates) > 0:
+        plan = None
+        def _apply(configs):
+            nonlocal plan
+            for config in configs:
+                start = time.perf_counter()
+                if plan is None:
+                    plan = OverridePlan.from_updates(updates, type(config))
+                config = plan.apply(config)
+                timings["update"] += time.perf_counter() - start
+                yield config
+        configs = _apply(configs)
+
+    latest_launch_ids = {}
+    for idx, config in enumerate(configs):
+        if config.script_id is None:
+            import sys
+            main_file = sys.modules['__main__'].__file__
+            config.script_id = Path(main_file).stem
+
+        content_hash = config.fingerprint() if config.output_dir is not None else None
+        
+        if config.run_id is None:
+            if resume is not None and content_hash is not None:
+                # resumed launches need run_ids that are the same across launches
+                config.run_id = f"{content_hash[:12]}-{idx}"
+            else:
+                # use a unique run_id if not provided
+                from uuid import uuid4
+                config.run_id = str(uuid4())
+        else:
+            config.run_id = f"{config.run_id}-{idx}"
+
+        config.launch_id = f"{time_tag}-{config.script_id}"
+        if resume == "latest" and config.output_dir is not None:
+            key = (config.output_dir, config.script_id)
+            if key not in latest_launch_ids:
+                latest_launch_ids[key] = latest_launch_id(*key) or config.launch_id
+            config.launch_id = latest_launch_ids[key]
+        elif resume is not None and resume != "latest":
+            config.launch_id = resume
+
+        if config.output_dir is not None:
+            config.run_dir = os.path.join(config.output_dir, config.launch_id, config.run_id) 
+            hashes[config.run_dir] = content_hash
+        yield config
+
+
+def _skip_completed(
+    configs: Iterable[RunConfig], 
+    hashes: Dict[str, str], 
+    skipped: List[RunConfig],
+) -> Iterator[RunConfig]:
+    """Skips the configs that already completed in their launch directory. Only 
+    configs with an output_dir (which are the ones in `hashes`) can be skipped."""
+    completed = {}
+    for config in configs:
+        if config.run_dir in hashes:
+            launch_dir = os.path.dirname(config.run_dir)
+            if launch_dir not in completed:
+                completed[launch_dir] = completed_fingerprints(launch_dir)
+            if hashes[config.run_dir] in completed[launch_dir]:
+                skipped.append(config)
+                continue
+        yield config
+
+
+def _progress(completed: int, failed: int, total: Optional[int]) -> str:
+    if total is None:
+        return f"Completed: {completed} ({failed} failed) | Total: ?"
+    return f"Completed: {completed} ({completed / max(total, 1):0.1%} -- {failed} failed) | Total: {total}"
+
+
+class Launch:
+    """A handle on a running sweep, returned by `launch`. Iterating over it yields a
+    `RunResult` for each config as it completes.
+
+    Example:
+        for result in launch(configs, executor=ProcessExecutor()):
+            if result.ok:
+                aggregate(result.config, result.output)
+    """
+
+    def __init__(
+        self, 
+        configs: Iterator[RunConfig], 
+        executor: Executor, 
+        total: Optional[int] = None,
+        max_in_flight: Optional[int] = None,
+        timings: Optional[Dict[str, float]] = None,
+        hashes: Optional[Dict[str, str]] = None,
+        skipped: Optional[List[RunConfig]] = None,
+        cache: Optional[ResultCache] = None,
+        dedupe: bool = False,
+    ):
+        self.executor = executor
+        self.cache = cache
+        self.dedupe = dedupe
+        self.total = total
+        self.max_in_flight = max_in_flight
+        if executor.max_in_flight is not None:
+            self.max_in_flight = min(max_in_flight or executor.max_in_flight, executor.max_in_flight)
+        self.timings = timings if timings is not None else defaultdict(float)
+        # configs that were not run because they completed in a previous launch
+        self.skipped = skipped if skipped is not None else []
+        self._hashes = hashes if hashes is not None else {}
+
+        self.completed: List[RunResult] = []
+        self.num_failed = 0
+        self.num_cached = 0
+        self.num_deduplicated = 0
+        self._cache_keys = {}
+        # for deduplication: the fingerprints of the configs that are running, the 
+        # duplicates waiting on them and the results of the configs that completed
+        self._running_fingerprints = {}
+        self._duplicates = {}
+        self._unique_results = {}
+        self._configs = configs
+        self._results = self._run()
+
+    def _lookup(self, config: RunConfig) -> Optional[RunResult]:
+        if self.cache is None:
+            return None
+        key = config.fingerprint()
+        hit, output = self.cache.get(key)
+        if hit:
+            return RunResult(config=config, output=output, wall_time=0.0, cached=True)
+        self._cache_keys[config.run_id] = key
+        return None
+
+    def _is_duplicate(self, config: RunConfig) -> Tuple[bool, Optional[RunResult]]:
+        """Returns whether the config duplicates one that was already launched and,
+        if that config has completed, the result for the duplicate."""
+        fingerprint = config.fingerprint()
+        if fingerprint in self._unique_results:
+            original = self._unique_results[fingerprint]
+            return True, RunResult(
+                config=config, 
+                output=original.output, 
+                error=original.error, 
+                wall_time=original.wall_time,
+                cached=original.cached,
+                duplicate_of=original.config.run_id,
+            )
+        if fingerprint in self._duplicates:
+            self._duplicates[fingerprint].append(config)
+            return True, None
+        self._duplicates[fingerprint] = []
+        self._running_fingerprints[config.run_id] = fingerprint
+        return False, None
 
-    return config
+    def _finish(self, result: RunResult) -> List[RunResult]:
+        """Record the result of a config, along with the results of its duplicates."""
+        results = [self._complete(result)]
+        fingerprint = self._running_fingerprints.pop(result.config.run_id, None)
+        if fingerprint is not None:
+            self._unique_results[fingerprint] = result
+            for config in self._duplicates.pop(fingerprint):
+                _, duplicate = self._is_duplicate(config)
+                results.append(self._complete(duplicate))
+        return results
+
+    def _complete(self, result: RunResult) -> RunResult:
+        config = result.config
+        if config.run_dir in self._hashes:
+            write_status(config.run_dir, self._hashes.pop(config.run_dir), result.error, result.wall_time)
+        key = self._cache_keys.pop(config.run_id, None)
+        if key is not None and result.ok:
+            self.cache.set(key, result.output)
+
+        self.completed.append(result)
+        if not result.ok:
+            self.num_failed += 1
+        if result.cached:
+            self.num_cached += 1
+        if result.duplicate_of is not None:
+            self.num_deduplicated += 1
+        return result
+
+    def _run(self) -> Iterator[RunResult]:
+        handles = []
+        exhausted = False
+        try:
+            while handles or not exhausted:
+                # keep at most `max_in_flight` configs submitted at a time so that we 
+                # don't need to hold the whole sweep in memory
+                while not exhausted and (self.max_in_flight is None or len(handles) < self.max_in_flight):
+                    config = next(self._configs, None)
+                    if config is None:
+                        exhausted = True
+                        continue
+                    if self.dedupe:
+                        is_duplicate, duplicate = self._is_duplicate(config)
+                        if is_duplicate:
+                            if duplicate is not None:
+                                yield self._complete(duplicate)
+                            continue
+                    cached = self._lookup(config)
+                    if cached is not None:
+                        yield from self._finish(cached)
+                    else:
+                        handles.append(self.executor.submit(config))
+                if not handles:
+                    break
+
+                complete, handles = self.executor.wait(handles)
+                for result in complete:
+                    yield from self._finish(result)
+        finally:
+            self.executor.shutdown()
+
+    def __iter__(self) -> Iterator[RunResult]:
+        return self
+
+    def __next__(self) -> RunResult:
+        return next(self._results)
+
+    def results(self) -> List[RunResult]:
+        """Wait for all of the configs to complete and return their results, in the
+        order they completed."""
+        for _ in self:
+            pass
+        return self.completed
+
+
+def launch(
+    configs: Union[RunConfig, Iterable[RunConfig]],
+    updates: Optional[List[str]] = None,
+    executor: Optional[Executor] = None,
+    max_in_flight: Optional[int] = None,
+    prepare_workers: int = 0,
+    resume: Optional[str] = None,
+    cache: Optional[ResultCache] = None,
+    dedupe: bool = False,
+) -> Launch:
+    """Launch one or more configs programmatically.
+
+    Parameters:
+        configs: A config, a list of configs or any iterable of configs. Lists are
+            updated in place.
+        updates (List[str]): Overrides of the form `key.subkey=value`.
+        executor (Executor): The backend used to run the configs. Defaults to 
+            running them one at a time in this process.
+        max_in_flight (int): The maximum number of configs submitted to the 
+            executor but not yet completed.
+        prepare_workers (int): The number of threads used to write configs to their
+            run dirs.
+        resume (str): The launch_id of a previous launch to resume, or "latest" for
+            the most recent launch of the script. Configs that already completed in 
+            that launch are skipped.
+        cache (ResultCache): If given, configs whose outputs are in the cache are
+            not run, and the outputs of successful runs are added to it. Configs are
+            keyed by their fingerprint, which ignores run identity fields.
+        dedupe (bool): If True, configs with the same fingerprint are only run once
+            and the result is reported for each of them.
+
+    Returns:
+        Launch: A handle that yields a `RunResult` for each config as it completes.
+    """
+    if isinstance(configs, RunConfig):
+        configs = [configs]
+    total = len(configs) if isinstance(configs, Sized) else None
+
+    time_tag = datetime.now().strftime('%Y-%m-%d-%H-%M-%S')
+    timings = defaultdict(float)
+    hashes, skipped = {}, []
+    prepared = _prepare_configs(configs, updates or [], time_tag, timings, hashes, resume=resume)
+    if isinstance(configs, list):
+        # NOTE: callers may rely on the configs being updated in place
+        def _update_in_place(prepared):
+            for idx, config in enumerate(prepared):
+                configs[idx] = config
+                yield config
+        prepared = _update_in_place(prepared)
+    if resume is not None:
+        prepared = _skip_completed(prepared, hashes, skipped)
+    prepared = _write_configs(prepared, prepare_workers, timings)
+
+    return Launch(
+        prepared, 
+        executor=executor if executor is not None else SerialExecutor(),
+        total=total, 
+        max_in_flight=max_in_flight,
+        timings=timings,
+        hashes=hashes,
+        skipped=skipped,
+        cache=cache,
+        dedupe=dedupe,
+    )
 
 
 import argparse
 from pathlib import Path
 
 def main(
-    configs: Union[RunConfig, List[RunConfig]], 
-):
+    configs: Union[RunConfig, Iterable[RunConfig]], 
+) -> List[RunResult]:
+    """Launch one or more configs, applying overrides from the command line.
+
+    `configs` can be a single config, a list of configs or any iterable of configs 
+    (e.g. a generator). Iterables are consumed lazily: each config is validated, 
+    written to disk and launched as it is produced.
+
+    Returns a `RunResult` for each config (with its output, error and wall time), 
+    in the order they completed.
+    """
     parser = argparse.ArgumentParser()
     parser.add_argument("-p", "--parallelize", action="store_true", default=False, help="Run configs in parallel")
+    parser.add_argument("--executor", type=str, default=None, help="Backend used to run configs: serial, thread, process, local, ray or one registered with an entry point (default: ray with -p)")
+    parser.add_argument("--num-workers", type=int, default=None, help="Number of workers for the thread and process executors")
+    parser.add_argument("--max-tasks-per-child", type=int, default=None, help="Replace each worker process of the process executor after this many configs")
     parser.add_argument("--gpus-per-config", type=int, default=1, help="Number of GPUs to use per config")
+    parser.add_argument("--cpus-per-config", type=int, default=1, help="Number of CPU cores to use per config (local executor)")
+    parser.add_argument("--memory-per-config", type=float, default=0.0, help="Memory in GB to reserve per config (local executor)")
+    parser.add_argument("--num-cpus", type=int, default=None, help="Number of CPU cores to schedule onto (local executor, default: all)")
+    parser.add_argument("--memory", type=float, default=None, help="Memory budget in GB to schedule onto (local executor, default: no budget)")
     parser.add_argument("--log-to-driver", action="store_true", default=False, help="Log to driver")
     parser.add_argument("--devices", type=str, default=None, help="Specify GPUs to use")
+    parser.add_argument("--prepare-workers", type=int, default=0, help="Number of threads used to create run dirs and write configs (default: write serially)")
+    parser.add_argument("--max-in-flight", type=int, default=None, help="Maximum number of configs submitted but not yet completed (default: no limit)")
+    parser.add_argument("--resume", type=str, default=None, help="Resume a previous launch (a launch_id or 'latest'), skipping configs that already completed")
+    parser.add_argument("--cache-dir", type=str, default=None, help="Directory of a cache of run outputs. Configs whose outputs are cached are not rerun")
+    parser.add_argument("--cache-max-size", type=float, default=None, help="Maximum size of the cache in GB, evicting the least recently used outputs (default: no limit)")
+    parser.add_argument("--dedupe", action="store_true", default=False, help="Run configs that are identical after the overrides only once")
     args, updates = parser.parse_known_args()
 
     if isinstance(configs, RunConfig):
         configs = [configs]
+    total = len(configs) if isinstance(configs, Sized) else None
 
     if args.devices is not None:
         print(args.devices)
         os.environ["CUDA_VISIBLE_DEVICES"] = args.devices
 
-    time_tag = datetime.now().strftime('%Y-%m-%d-%H-%M-%S')
-    for idx, config in enumerate(configs):
-        config: RunConfig = _update_config(config, updates)
-        configs[idx] = config
-        if config.script_id is None:
-            import sys
-            main_file = sys.modules['__main__'].__file__
-            config.script_id = Path(main_file).stem
-        
-        if config.run_id is None:
-            # use a unique run_id if not provided
-            from uuid import uuid4
-            config.run_id = str(uuid4())
-        else:
-            config.run_id = f"{config.run_id}-{idx}"
+    executor = None
+    if (args.executor is not None or args.parallelize) and (total is None or total > 0):
+        executor = get_executor(args.executor or "ray").from_args(args)
 
-        config.launch_id = f"{time_tag}-{config.script_id}"
-        if config.output_dir is not None:
-            config.run_dir = os.path.join(config.output_dir, config.launch_id, config.run_id) 
-            os.makedirs(config.run_dir, exist_ok=True)
-            config.to_yaml(os.path.join(config.run_dir, "config.yaml"))
-
-    use_ray = args.parallelize and len(configs) > 0
-    if use_ray:
-        import ray
-        # SE(03/02): ray was killing workers due to OOM, but it didn't seem to be necessary 
-        os.environ["RAY_memory_monitor_refresh_ms"] = "0"
-        ray.init(ignore_reinit_error=True, log_to_driver=args.log_to_driver) #, _temp_dir="/home/sabri/tmp")
-
-    print(f"Running {len(configs)} configs")
-
-    # Run each script in parallel using Ray
-    results = []
-    if not use_ray:
-        for config in configs: 
-            out = config.run()
-            results.append((out, config, None))
+    cache = None
+    if args.cache_dir is not None:
+        max_size = int(args.cache_max_size * 1e9) if args.cache_max_size is not None else None
+        cache = DiskCache(args.cache_dir, max_size=max_size)
+
+    if total is None:
+        print("Running configs as they are generated")
     else:
-        completed = 0
-        failed = 0
-        total = len(configs)
-        print(f"Completed: {completed} ({completed / total:0.1%}) | Total: {total}")
-
-        # we set the number of gpus required by each remote equal to the number of
-        # gpus required by each config
-        futures = [
-            ray.remote(num_gpus=args.gpus_per_config)(execute_config).remote(config) 
-            for config in configs
-        ]
-        
-        while futures:
-            complete, futures = ray.wait(futures)
-            for output, config, error in ray.get(complete):
-                completed += 1
-                if error is not None:
-                    failed += 1
-                    config.print()
-                    print(error)
-                else: 
-                    print(f"Run {config.run_id} (status: completed) (run_dir: {config.run_dir})")
-                    results.append((output, config, error))
-                    
-            print(f"Completed: {completed} ({completed / total:0.1%} -- {failed} failed) | Total: {total}")
-
-        ray.shutdown()
+        print(f"Running {total} configs")
+
+    handle = launch(
+        configs, 
+        updates=updates, 
+        executor=executor, 
+        max_in_flight=args.max_in_flight, 
+        prepare_workers=args.prepare_workers,
+        resume=args.resume,
+        cache=cache,
+        dedupe=args.dedupe,
+    )
+    print(_progress(0, 0, total))
+    for result in handle:
+        config = result.config
+        if result.error is not None:
+            config.print()
+            print(result.error)
+        else: 
+            status = "cached" if result.cached else "completed"
+            if result.duplicate_of is not None:
+                status = f"duplicate of {result.duplicate_of}"
+            print(f"Run {config.run_id} (status: {status}) (run_dir: {config.run_dir})")
+        print(_progress(len(handle.completed), handle.num_failed, total))
+
+    if handle.num_deduplicated > 0:
+        print(f"Saved {handle.num_deduplicated} runs by deduplicating identical configs")
+    if handle.num_cached > 0:
+        print(f"Loaded {handle.num_cached} outputs from the cache")
+    if handle.skipped:
+        print(f"Skipped {len(handle.skipped)} configs that completed in a previous launch")
+
+    timings = handle.timings
+    workers = f", {args.prepare_workers} threads" if args.prepare_workers > 0 else ""
+    print(
+        f"Preparation time -- update: {timings['update']:0.2f}s | "
+        f"write: {timings['write']:0.2f}s (summed over writes{workers})"
+    )
+    return handle.completed
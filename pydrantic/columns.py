@@ -0,0 +1,158 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Sequence
+
+from pydrantic.config import BaseConfig, _flatten_config
+
+
+@dataclass
+class Columns:
+    """Many configs flattened into one column per (flattened) key, e.g. to analyze
+    a sweep or join it against metrics.
+
+    Attributes:
+        num_rows (int): The number of configs.
+        values (Dict[str, List]): The values of each key, in the order of the configs.
+            Configs without the key have None.
+        missing (Dict[str, List[bool]]): Whether each config is missing the key. This
+            distinguishes a missing key from a value of None.
+        kinds (Dict[str, str]): The type of the values of each key: "bool", "int",
+            "float", "str" or "object" for anything else (including mixed types).
+    """
+    num_rows: int
+    values: Dict[str, List[Any]]
+    missing: Dict[str, List[bool]]
+    kinds: Dict[str, str]
+
+    @property
+    def keys(self) -> List[str]:
+        return list(self.values)
+
+    def to_numpy(self) -> Dict[str, Any]:
+        """Returns `{key: (array, mask)}` where `mask` is True where the key is missing.
+        "bool", "int" and "float" columns are numpy arrays of that type, with missing
+        values set to False, 0 and nan (and Nones in "float" columns set to nan). 
+        "bool" and "int" columns that contain Nones, and other columns, are object 
+        arrays. Requires numpy.
+        """
+        import numpy as np
+
+        arrays = {}
+        for key, values in self.values.items():
+            kind = self.kinds[key]
+            missing = self.missing[key]
+            mask = np.array(missing, dtype=bool)
+            if kind in ("bool", "int") and any(v is None and not m for v, m in zip(values, missing)):
+                # False or 0 would be indistinguishable from real values
+                kind = "object"
+            if kind in _NUMPY_FILL:
+                dtype, fill = _NUMPY_FILL[kind]
+                array = np.array([fill if v is None else v for v in values], dtype=dtype)
+            else:
+                array = np.empty(self.num_rows, dtype=object)
+                array[:] = values
+            arrays[key] = (array, mask)
+        return arrays
+
+    def to_arrow(self):
+        """Returns a `pyarrow.Table` where missing values are null. Columns of kind
+        "object" are converted to strings. Requires pyarrow."""
+        import pyarrow as pa
+
+        arrays = {}
+        for key, values in self.values.items():
+            if self.kinds[key] == "object":
+                values = [None if v is None else str(v) for v in values]
+            arrays[key] = pa.array(values, type=_arrow_type(self.kinds[key]))
+        return pa.table(arrays)
+
+    def to_pandas(self):
+        """Returns a `pandas.DataFrame` with a column per key, using the nullable
+        pandas dtypes for "bool", "int" and "str" columns so that missing values are
+        `pd.NA`. Requires pandas."""
+        import pandas as pd
+
+        data = {}
+        for key, values in self.values.items():
+            kind = self.kinds[key]
+            if kind == "object":
+                data[key] = pd.Series(values, dtype=object)
+            else:
+                data[key] = pd.Series(values, dtype=_PANDAS_DTYPES[kind])
+        return pd.DataFrame(data, index=pd.RangeIndex(self.num_rows))
+
+
+_NUMPY_FILL = {"bool": ("bool", False), "int": ("int64", 0), "float": ("float64", float("nan"))}
+
+_PANDAS_DTYPES = {"bool": "boolean", "int": "Int64", "float": "float64", "str": "string"}
+
+
+def _arrow_type(kind: str):
+    import pyarrow as pa
+    return {
+        "bool": pa.bool_(), "int": pa.int64(), "float": pa.float64(), "str": pa.string(), "object": pa.string()
+    }[kind]
+
+
+def _kind(values: Sequence[Any]) -> str:
+    types = {type(v) for v in values if v is not None}
+    if len(types) == 0:
+        return "object"
+    if types == {bool}:
+        return "bool"
+    if types == {int}:
+        # numpy and arrow can't hold integers wider than 64 bits
+        return "int" if all(v is None or -2**63 <= v < 2**63 for v in values) else "object"
+    if types <= {int, float}:
+        return "float"
+    if types == {str}:
+        return "str"
+    return "object"
+
+
+def to_columns(
+    configs: Iterable[BaseConfig],
+    sep: str = ".",
+    exclude: Sequence[str] = (),
+) -> Columns:
+    """Flattens configs straight into columns, in one pass over the configs. The keys
+    are the same as those of `BaseConfig.flatten` (with `sep` between the parts), in
+    the order they first appear.
+
+    Example:
+        columns = to_columns(Sweep(base).grid(lr=[1e-4, 1e-3], seed=[0, 1]))
+        df = columns.to_pandas()
+
+    Parameters:
+        configs (Iterable[BaseConfig]): The configs, one per row.
+        sep (str): The separator between the parts of the keys.
+        exclude (Sequence[str]): Keys to leave out.
+    """
+    excluded = set(exclude)
+    values: Dict[str, List[Any]] = {}
+    missing: Dict[str, List[bool]] = {}
+    num_rows = 0
+    for config in configs:
+        flattened = {}
+        _flatten_config(config, "", sep, flattened)
+        num_present = 0
+        for key, value in flattened.items():
+            column = values.get(key)
+            if column is None:
+                if key in excluded:
+                    continue
+                # the key is missing from all the previous configs
+                column = values[key] = [None] * num_rows
+                missing[key] = [True] * num_rows
+            column.append(value)
+            missing[key].append(False)
+            num_present += 1
+        num_rows += 1
+        if num_present < len(values):
+            # pad the keys this config is missing
+            for key, column in values.items():
+                if len(column) < num_rows:
+                    column.append(None)
+                    missing[key].append(True)
+
+    kinds = {key: _kind(column) for key, column in values.items()}
+    return Columns(num_rows=num_rows, values=values, missing=missing, kinds=kinds)
@@ -1,18 +1,18 @@
 from __future__ import annotations
-import yaml
-from typing import Any, Dict, List, Optional, Type, Union
+import hashlib
+from collections import deque
+from typing import Any, ClassVar, Dict, List, Optional, Tuple, Type, Union
 from abc import abstractmethod
 
 from pathlib import Path
 from pydantic import BaseModel, ConfigDict, field_validator
 from pydantic import Field, model_validator
 
-from pydrantic.utils import type_from_dict, save_dill, save_pickle, import_object, type_to_dict, unflatten_dict, flatten_dict, load_dill, load_pickle
+from pydrantic.utils import type_from_dict, save_dill, save_pickle, import_object, type_to_dict, unflatten_dict, flatten_dict, load_dill, load_pickle, _yaml_dumpers
+from pydrantic.utils import load_json, save_json, load_msgpack, save_msgpack
 from pydrantic.variables import BaseVariable, VariableResolutionError
 
 
-MAX_RESOLUTION_DEPTH = 5
-
 class BaseConfig(BaseModel):
     model_config = ConfigDict(
         extra="forbid",
@@ -22,58 +22,103 @@ class BaseConfig(BaseModel):
     )
     _variables: Optional[Dict[str, BaseVariable]] = None
 
+    # fields that are left out of the fingerprint
+    _fingerprint_exclude: ClassVar[Tuple[str, ...]] = ()
+
+    # the memoized fingerprint and dict of the config, each with the subconfigs (and 
+    # their fingerprints or dicts) it used.
+    # NOTE: these are slots rather than private attributes, so that they don't affect
+    # equality and aren't carried over by copies (e.g. `model_copy(update=...)`) or 
+    # pickling
+    __slots__ = ("_fingerprint", "_dict")
+
     @model_validator(mode="wrap")
     def resolve_variables(cls, values: dict[str, Any], handler) -> dict[str, Any]:
         if isinstance(values, BaseConfig):
             return handler(values)
         
-        variables = {}
-        for _ in range(MAX_RESOLUTION_DEPTH):
-            variables_remaining = False
-            for k, v in values.items():
-                if isinstance(v, BaseVariable):
-                    try:
-                        values[k] = v.resolve(values)
-                    except VariableResolutionError as e:
-                        variables_remaining = True
-                    else:
-                        variables[k] = v
-            if not variables_remaining:
-                break
-        else:
-            raise VariableResolutionError(f"Max resolution depth reached for {values}")
-            
+        variables = _resolve_variables(values)
 
         config: BaseConfig = handler(values)
         config._variables = variables
         return config
     
+    def __setattr__(self, name: str, value: Any):
+        super().__setattr__(name, value)
+        if not name.startswith("_"):
+            # NOTE: we write to the slots directly, since this runs on every assignment
+            object.__setattr__(self, "_fingerprint", None)
+            object.__setattr__(self, "_dict", None)
+
     def get(self, key, default=None):
         return getattr(self, key, default)
 
+    def fingerprint(self) -> str:
+        """A deterministic digest of the config's contents: its type, its field values 
+        and the fingerprints of its subconfigs. Fields in `_fingerprint_exclude` (e.g.
+        the run identity fields of `RunConfig`) are left out. 
+
+        The fingerprint is memoized and recomputed when a field of the config or of one
+        of its subconfigs is assigned. Mutating a field value in place (e.g. appending 
+        to a list) is not detected.
+        """
+        memo = getattr(self, "_fingerprint", None)
+        if memo is not None and all(child.fingerprint() == digest for child, digest in memo[1]):
+            return memo[0]
+
+        children = []
+        cls = type(self)
+        parts = [f"{cls.__module__}:{cls.__qualname__}"]
+        for k, v in self.__dict__.items():
+            if k in self._fingerprint_exclude:
+                continue
+            parts.append(f"F{k}")
+            _fingerprint_parts(v, parts, children)
+        digest = hashlib.sha256("\x00".join(parts).encode()).hexdigest()
+        object.__setattr__(self, "_fingerprint", (digest, children))
+        return digest
+
+    def equivalent(self, other: BaseConfig) -> bool:
+        """Whether two configs have the same fingerprint."""
+        return isinstance(other, BaseConfig) and self.fingerprint() == other.fingerprint()
+
     def to_dict(self):
-        return self._to_dict(self)
-    
-    def _to_dict(self, obj: any):
-        if isinstance(obj, BaseConfig):
-            data = {
-                "_config_type": type_to_dict(type(obj))
-            }
-            for k, v in obj:
-                data[k] = self._to_dict(v)
-            return data
-        elif isinstance(obj, type):
-            return type_to_dict(obj)
-        elif isinstance(obj, list):
-            return [self._to_dict(i) for i in obj]
-        elif isinstance(obj, dict):
-            return {k: self._to_dict(v) for k, v in obj.items()}
-        else:
-            return obj        
+        """The config as a nested dict of builtin values, with the type of each config 
+        under `_config_type`. Returns a fresh copy that the caller may mutate."""
+        return _copy_containers(self._cached_dict())
+
+    def _cached_dict(self) -> Dict:
+        """Like `to_dict`, but memoized in the same way as `fingerprint`: the dicts of 
+        unchanged subconfigs are reused, so shared subconfigs are only serialized once. 
+        The returned dict is shared with the cache and must not be mutated.
+
+        Only configs without list or dict fields are memoized, since the copies of 
+        those would go stale if they were mutated in place (e.g. `kwargs["a"] = 1`).
+        Their subconfigs are still memoized.
+        """
+        memo = getattr(self, "_dict", None)
+        if memo is not None and all(child._cached_dict() is data for child, data in memo[1]):
+            return memo[0]
+
+        children = []
+        cacheable = True
+        data = {"_config_type": type_to_dict(type(self))}
+        for k, v in self:
+            data[k] = _cached_to_dict(v, children)
+            if isinstance(v, (list, dict)):
+                cacheable = False
+        if cacheable:
+            object.__setattr__(self, "_dict", (data, children))
+        return data
     
-
     @classmethod
-    def from_dict(cls, data: Dict, strict: bool = True):
+    def from_dict(cls, data: Dict, strict: bool = True, lazy: bool = False):
+        """Loads a config saved with `to_dict`. With `lazy=True`, returns a `LazyConfig`
+        that only imports and validates the fields that are accessed."""
+        if lazy:
+            from pydrantic.lazy import LazyConfig
+            return LazyConfig(data, cls, strict=strict)
+
         if "_config_type" in data:
             if isinstance(data["_config_type"], dict):
                 cls = type_from_dict(data["_config_type"])
@@ -111,14 +156,35 @@ class BaseConfig(BaseModel):
         return cls.model_validate(result, strict=strict)
     
     def to_yaml(self, path: str):
+        import yaml
+
         with open(path, "w") as f:
-            yaml.dump(self.to_dict(), f)
+            yaml.dump(self.to_dict(), f, Dumper=_yaml_dumpers()[0])
 
     @classmethod
-    def from_yaml(cls, path: str, strict: bool = True):
+    def from_yaml(cls, path: str, strict: bool = True, lazy: bool = False):
+        import yaml
+
         with open(path, "r") as f:
             data = yaml.load(f, Loader=yaml.CLoader)
-        return cls.from_dict(data, strict=strict)
+        return cls.from_dict(data, strict=strict, lazy=lazy)
+
+    def to_json(self, path: str):
+        """Saves the config as JSON, which is much faster to load than yaml and, 
+        unlike dill and pickle, safe to load from untrusted sources."""
+        save_json(self._cached_dict(), path)
+
+    @classmethod
+    def from_json(cls, path: str, strict: bool = True):
+        return cls.from_dict(load_json(path), strict=strict)
+
+    def to_msgpack(self, path: str):
+        """Saves the config as msgpack. Requires the `msgpack` package."""
+        save_msgpack(self._cached_dict(), path)
+
+    @classmethod
+    def from_msgpack(cls, path: str, strict: bool = True):
+        return cls.from_dict(load_msgpack(path), strict=strict)
 
     def to_dill(self, path: str):
         save_dill(self.to_dict(), path)
@@ -165,11 +231,16 @@ class BaseConfig(BaseModel):
             print(self)
 
     def flatten(self):
-        return flatten_dict(self.to_dict())
+        return flatten_dict(self._cached_dict())
         
 
 
 class RunConfig(BaseConfig):
+    # these identify a run rather than describe what it computes
+    _fingerprint_exclude: ClassVar[Tuple[str, ...]] = (
+        "run_dir", "output_dir", "run_id", "launch_id", "script_id"
+    )
+
     run_dir: Optional[str] = None
     output_dir: Optional[str] = None
     run_id: Optional[str] = None
@@ -186,6 +257,153 @@ class RunConfig(BaseConfig):
 
 
 
+_SCALAR_TYPES = (type(None), bool, int, float, str, bytes)
+
+
+def _resolve_variables(values: Dict[str, Any]) -> Dict[str, BaseVariable]:
+    """Resolves the variables in `values` in place, in dependency order, and returns 
+    them by key.
+
+    Variables are resolved in topological order of their dependencies, so a chain of 
+    any length takes a single pass. Variables whose dependencies are unknown (see 
+    `BaseVariable.dependencies`) are retried until they resolve.
+    """
+    pending = {k: v for k, v in values.items() if isinstance(v, BaseVariable)}
+    if len(pending) == 0:
+        return {}
+
+    dependencies: Dict[str, Optional[List[str]]] = {}
+    dependents: Dict[str, List[str]] = {k: [] for k in pending}
+    num_unresolved: Dict[str, int] = {}
+    for key, variable in pending.items():
+        deps = variable.dependencies()
+        if deps is not None:
+            deps = [dep for dep in dict.fromkeys(deps) if dep in pending and dep != key]
+            for dep in deps:
+                dependents[dep].append(key)
+        dependencies[key] = deps
+        num_unresolved[key] = len(deps) if deps is not None else 0
+
+    resolved = {}
+    ready = deque(k for k in pending if num_unresolved[k] == 0)
+    while True:
+        num_resolved = len(resolved)
+        deferred = []
+        while ready:
+            key = ready.popleft()
+            try:
+                values[key] = pending[key].resolve(values)
+            except VariableResolutionError:
+                # e.g. a custom variable that references a variable we haven't 
+                # resolved yet
+                deferred.append(key)
+                continue
+            resolved[key] = pending[key]
+            for dependent in dependents[key]:
+                num_unresolved[dependent] -= 1
+                if num_unresolved[dependent] == 0:
+                    ready.append(dependent)
+        # retry the deferred variables for as long as we make progress
+        if len(deferred) == 0 or len(resolved) == num_resolved:
+            break
+        ready.extend(deferred)
+
+    if len(resolved) < len(pending):
+        unresolved = [k for k in pending if k not in resolved]
+        cycle = _find_cycle(unresolved, dependencies)
+        if cycle is not None:
+            raise VariableResolutionError(
+                f"Cyclic dependency between variables: {' -> '.join(cycle)}"
+            )
+        raise VariableResolutionError(
+            f"Could not resolve variables: {', '.join(unresolved)}"
+        )
+    return resolved
+
+
+def _find_cycle(keys: List[str], dependencies: Dict[str, Optional[List[str]]]) -> Optional[List[str]]:
+    """Finds a cycle in the dependencies between the unresolved `keys`, if any."""
+    unresolved = set(keys)
+
+    def _deps(key):
+        return iter([dep for dep in dependencies[key] or [] if dep in unresolved])
+
+    # iterative depth first search, where `path` holds the keys being visited
+    done = set()
+    for start in keys:
+        if start in done:
+            continue
+        path, stack = [start], [_deps(start)]
+        while stack:
+            for dep in stack[-1]:
+                if dep in path:
+                    return path[path.index(dep):] + [dep]
+                if dep not in done:
+                    path.append(dep)
+                    stack.append(_deps(dep))
+                    break
+            else:
+                done.add(path.pop())
+                stack.pop()
+    return None
+
+
+def _cached_to_dict(obj: Any, children: List[Tuple[BaseConfig, Dict]]) -> Any:
+    if isinstance(obj, BaseConfig):
+        data = obj._cached_dict()
+        children.append((obj, data))
+        return data
+    elif isinstance(obj, type):
+        return type_to_dict(obj)
+    elif isinstance(obj, list):
+        return [_cached_to_dict(i, children) for i in obj]
+    elif isinstance(obj, dict):
+        return {k: _cached_to_dict(v, children) for k, v in obj.items()}
+    else:
+        return obj
+
+
+def _copy_containers(obj: Any) -> Any:
+    # NOTE: shared subconfigs share their dicts in the cache, so we copy them to
+    # give callers independent dicts (yaml would otherwise emit them as aliases)
+    if type(obj) is dict:
+        return {k: _copy_containers(v) for k, v in obj.items()}
+    elif type(obj) is list:
+        return [_copy_containers(i) for i in obj]
+    return obj
+
+
+def _fingerprint_parts(value: Any, parts: List[str], children: List[Tuple[BaseConfig, str]]):
+    # NOTE: every value is tagged with its type so that e.g. 1, 1.0 and "1" differ
+    if type(value) in _SCALAR_TYPES:
+        # we check the exact type first since isinstance checks on configs are slow
+        parts.append(f"{type(value).__name__}:{value!r}")
+    elif isinstance(value, BaseConfig):
+        digest = value.fingerprint()
+        children.append((value, digest))
+        parts.append(f"C{digest}")
+    elif isinstance(value, (bool, int, float, str, bytes)):
+        parts.append(f"{type(value).__name__}:{value!r}")
+    elif isinstance(value, type):
+        parts.append(f"T{value.__module__}:{value.__qualname__}")
+    elif isinstance(value, (list, tuple)):
+        parts.append(f"L{len(value)}")
+        for item in value:
+            _fingerprint_parts(item, parts, children)
+    elif isinstance(value, dict):
+        parts.append(f"D{len(value)}")
+        for key in sorted(value, key=repr):
+            _fingerprint_parts(key, parts, children)
+            _fingerprint_parts(value[key], parts, children)
+    elif isinstance(value, (set, frozenset)):
+        parts.append(f"S{len(value)}")
+        for item in sorted(value, key=repr):
+            _fingerprint_parts(item, parts, children)
+    else:
+        # NOTE: this is only deterministic for objects with a stable repr
+        parts.append(f"O{type(value).__module__}:{type(value).__qualname__}:{value!r}")
+
+
 class ObjectConfig(BaseConfig):
     target: Union[Type, str, None] = None
     kwargs: Optional[Dict] = Field(default_factory=dict)
@@ -220,33 +438,80 @@ class ObjectConfig(BaseConfig):
         )
 
 
+_MISSING = object()
+
+
+def _hashable(value: Any) -> Any:
+    try:
+        hash(value)
+    except TypeError:
+        # e.g. sets or arrays, which flatten_dict leaves as is
+        return (type(value).__qualname__, repr(value))
+    return value
+
+
+def _flatten_config(obj: Any, key: str, sep: str, out: Dict[str, Any]):
+    """Equivalent to `flatten_dict(config.to_dict(), sep=sep)`, but flattens the 
+    config in a single pass without building the nested dict."""
+    if isinstance(obj, BaseConfig):
+        prefix = f"{key}{sep}" if key else ""
+        cls = type(obj)
+        out[f"{prefix}_config_type{sep}_is_type"] = True
+        out[f"{prefix}_config_type{sep}_module"] = cls.__module__
+        out[f"{prefix}_config_type{sep}_qualname"] = cls.__qualname__
+        for k, v in obj:
+            if type(v) in _SCALAR_TYPES:
+                out[f"{prefix}{k}"] = v
+            else:
+                _flatten_config(v, f"{prefix}{k}", sep, out)
+    elif isinstance(obj, dict):
+        for k, v in obj.items():
+            _flatten_config(v, f"{key}{sep}{k}" if key else k, sep, out)
+    elif isinstance(obj, list):
+        for i, item in enumerate(obj):
+            _flatten_config(item, f"{key}{sep}{i}", sep, out)
+    elif isinstance(obj, type):
+        _flatten_config(type_to_dict(obj), key, sep, out)
+    else:
+        out[key] = obj
+
+
 def get_unique_ids(
     configs: List[BaseConfig], 
     exclude: List[str] = [],
     sep: str = "."
 ) -> List[str]:
-    flattened_configs = [flatten_dict(config.to_dict(), sep=sep) for config in configs]
-
-    differing_keys = set()
-    all_keys = set([key for config in flattened_configs for key in config.keys()])
-    for key in all_keys:
-        if key in exclude:
-            continue
-        values = set()
-        for config in flattened_configs:
-            if key in config:
-                values.add(config[key])
-        if len(values) > 1:
-            differing_keys.add(key)
+    """Builds an id for each config from the (flattened) fields whose values differ 
+    between the configs, e.g. `lr=0.001-num_layers=4`.
+
+    The configs are flattened into columns in a single pass (see `to_columns`) and a
+    key differs if any of its values differs from the first value in its column. The
+    keys in each id are ordered by their first appearance.
+    """
+    from pydrantic.columns import to_columns
+    columns = to_columns(configs, sep=sep, exclude=exclude)
+
+    differing_keys = []
+    for key, column in columns.values.items():
+        first = _MISSING
+        for value, missing in zip(column, columns.missing[key]):
+            if missing:
+                continue
+            value = _hashable(value)
+            if first is _MISSING:
+                first = value
+            elif value is not first and value != first:
+                differing_keys.append(key)
+                break
 
     unique_ids = []
-    for config in flattened_configs:
+    for idx in range(columns.num_rows):
         id_parts = [
-            f"{key.split('.')[-1]}={config[key]}" 
+            f"{key.split('.')[-1]}={columns.values[key][idx]}" 
             for key in differing_keys 
-            if key in config
+            if not columns.missing[key][idx]
         ]
         unique_id = '-'.join(id_parts)
         unique_ids.append(unique_id)
 
-    return unique_ids
\ No newline at end of file
+    return unique_ids
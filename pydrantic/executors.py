@@ -0,0 +1,448 @@
+import os
+import sys
+import time
+from abc import ABC, abstractmethod
+from argparse import Namespace
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type
+
+from pydrantic.config import RunConfig
+
+
+@dataclass
+class RunResult:
+    """The result of running a config, with the wall time of the run in seconds.
+
+    For backwards compatibility, a result unpacks into `(output, config, error)`.
+    """
+    config: RunConfig
+    output: Any = None
+    error: Optional[Exception] = None
+    wall_time: Optional[float] = None
+    # whether the output was loaded from a `ResultCache` instead of running the config
+    cached: bool = False
+    # the run_id of the identical config whose result this is, if it was deduplicated
+    duplicate_of: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __iter__(self):
+        return iter((self.output, self.config, self.error))
+
+
+def execute_config(config: RunConfig) -> RunResult:
+    # os.makedirs(config.run_dir, exist_ok=True)
+    start = time.perf_counter()
+    try:
+        output = config.run()
+    except Exception as e:
+        return RunResult(config=config, error=e, wall_time=time.perf_counter() - start)
+    return RunResult(config=config, output=output, wall_time=time.perf_counter() - start)
+
+
+class Executor(ABC):
+    """Interface for the backends that `pydrantic.main` uses to run configs.
+
+    A backend submits configs, returning an opaque handle for each, and waits until
+    at least one of a list of handles has completed. Results are `RunResult`s, as
+    returned by `execute_config`.
+    """
+
+    # the maximum number of configs worth submitting at once (e.g. backends that 
+    # run configs one at a time set this to 1 so that sweeps are consumed lazily)
+    max_in_flight: Optional[int] = None
+
+    @classmethod
+    def from_args(cls, args: Namespace) -> "Executor":
+        """Build the executor from the command line arguments parsed by `main`. 
+        Arguments that are missing from `args` take the constructor defaults."""
+        return cls()
+
+    @abstractmethod
+    def submit(self, config: RunConfig) -> Any:
+        pass
+
+    @abstractmethod
+    def wait(self, handles: List[Any]) -> Tuple[List[RunResult], List[Any]]:
+        """Block until at least one of `handles` has completed. Returns the results
+        of the completed handles and the handles that are still pending."""
+        pass
+
+    def shutdown(self):
+        pass
+
+
+EXECUTORS: Dict[str, Type[Executor]] = {}
+
+
+def register_executor(name: str) -> Callable[[Type[Executor]], Type[Executor]]:
+    """Class decorator that makes an executor available to `main` under `name`
+    (i.e. with `--executor name`).
+
+    Executors in other packages can also be registered with an entry point in the
+    `pydrantic.executors` group.
+    """
+    def _register(cls: Type[Executor]) -> Type[Executor]:
+        EXECUTORS[name] = cls
+        return cls
+    return _register
+
+
+def _entry_points() -> List[Any]:
+    from importlib.metadata import entry_points
+    if sys.version_info >= (3, 10):
+        return list(entry_points(group="pydrantic.executors"))
+    # before Python 3.10, `entry_points` takes no arguments and returns a dict of groups
+    return list(entry_points().get("pydrantic.executors", []))
+
+
+def get_executor(name: str) -> Type[Executor]:
+    if name in EXECUTORS:
+        return EXECUTORS[name]
+
+    for entry_point in _entry_points():
+        if entry_point.name == name:
+            EXECUTORS[name] = entry_point.load()
+            return EXECUTORS[name]
+    raise ValueError(
+        f"Unknown executor `{name}`, expected one of: {', '.join(available_executors())}"
+    )
+
+
+def available_executors() -> List[str]:
+    names = list(EXECUTORS)
+    for entry_point in _entry_points():
+        if entry_point.name not in names:
+            names.append(entry_point.name)
+    return names
+
+
+@register_executor("serial")
+class SerialExecutor(Executor):
+    """Runs configs one at a time in the current process."""
+
+    max_in_flight = 1
+
+    def submit(self, config: RunConfig) -> Any:
+        return config
+
+    def wait(self, handles: List[Any]) -> Tuple[List[RunResult], List[Any]]:
+        return [execute_config(handles[0])], handles[1:]
+
+
+class _FuturesExecutor(Executor):
+    """Base class for executors built on `concurrent.futures` pools."""
+
+    def __init__(self, pool):
+        from concurrent import futures
+        self._futures = futures
+        self._pool = pool
+        self._configs = {}
+
+    def submit(self, config: RunConfig) -> Any:
+        future = self._pool.submit(execute_config, config)
+        self._configs[future] = config
+        return future
+
+    def wait(self, handles: List[Any]) -> Tuple[List[RunResult], List[Any]]:
+        complete, pending = self._futures.wait(handles, return_when=self._futures.FIRST_COMPLETED)
+        results = []
+        for future in complete:
+            config = self._configs.pop(future)
+            try:
+                results.append(future.result())
+            except Exception as e:
+                # e.g. the worker process died or the output could not be pickled
+                results.append(RunResult(config=config, error=e))
+        return results, list(pending)
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+
+
+@register_executor("thread")
+class ThreadExecutor(_FuturesExecutor):
+    """Runs configs in a pool of threads in the current process. Useful for
+    configs that mostly wait on I/O or release the GIL.
+
+    Parameters:
+        num_workers (int): The number of threads. Defaults to the
+            `concurrent.futures` default.
+    """
+
+    def __init__(self, num_workers: Optional[int] = None):
+        from concurrent import futures
+        super().__init__(futures.ThreadPoolExecutor(max_workers=num_workers))
+
+    @classmethod
+    def from_args(cls, args: Namespace) -> Executor:
+        return cls(num_workers=getattr(args, "num_workers", None))
+
+
+@register_executor("process")
+class ProcessExecutor(_FuturesExecutor):
+    """Runs configs in a local pool of worker processes, without the startup and
+    object store overhead of Ray.
+
+    Parameters:
+        num_workers (int): The number of worker processes. Defaults to the number
+            of CPUs.
+        max_tasks_per_child (int): If set, each worker process is replaced after
+            running this many configs (requires Python 3.11+).
+    """
+
+    def __init__(self, num_workers: Optional[int] = None, max_tasks_per_child: Optional[int] = None):
+        from concurrent import futures
+
+        kwargs = {}
+        if max_tasks_per_child is not None:
+            if sys.version_info < (3, 11):
+                raise ValueError("`max_tasks_per_child` requires Python 3.11 or later.")
+            kwargs["max_tasks_per_child"] = max_tasks_per_child
+        super().__init__(futures.ProcessPoolExecutor(max_workers=num_workers, **kwargs))
+
+    @classmethod
+    def from_args(cls, args: Namespace) -> Executor:
+        return cls(
+            num_workers=getattr(args, "num_workers", None),
+            max_tasks_per_child=getattr(args, "max_tasks_per_child", None),
+        )
+
+
+@register_executor("ray")
+class RayExecutor(Executor):
+    """Runs each config as a Ray task."""
+
+    def __init__(self, gpus_per_config: int = 1, log_to_driver: bool = False):
+        import ray
+        self._ray = ray
+        # SE(03/02): ray was killing workers due to OOM, but it didn't seem to be necessary
+        os.environ["RAY_memory_monitor_refresh_ms"] = "0"
+        ray.init(ignore_reinit_error=True, log_to_driver=log_to_driver) #, _temp_dir="/home/sabri/tmp")
+
+        # we set the number of gpus required by each remote equal to the number of
+        # gpus required by each config
+        self._remote_fn = ray.remote(num_gpus=gpus_per_config)(execute_config)
+
+    @classmethod
+    def from_args(cls, args: Namespace) -> Executor:
+        return cls(
+            gpus_per_config=getattr(args, "gpus_per_config", 1),
+            log_to_driver=getattr(args, "log_to_driver", False),
+        )
+
+    def submit(self, config: RunConfig) -> Any:
+        return self._remote_fn.remote(config)
+
+    def wait(self, handles: List[Any]) -> Tuple[List[RunResult], List[Any]]:
+        complete, handles = self._ray.wait(handles)
+        return self._ray.get(complete), handles
+
+    def shutdown(self):
+        self._ray.shutdown()
+
+
+@dataclass
+class Allocation:
+    devices: List[str] = field(default_factory=list)
+    cpus: List[int] = field(default_factory=list)
+    memory: float = 0.0
+
+    def env(self) -> Dict[str, str]:
+        """Environment variables that pin a run to its devices and thread count."""
+        num_threads = str(max(len(self.cpus), 1))
+        return {
+            "CUDA_VISIBLE_DEVICES": ",".join(self.devices),
+            "OMP_NUM_THREADS": num_threads,
+            "MKL_NUM_THREADS": num_threads,
+        }
+
+
+class ResourcePool:
+    """Tracks the devices, CPU cores and memory (in GB) that are free on this node.
+
+    Devices are just names (e.g. the indices used in `CUDA_VISIBLE_DEVICES`), so
+    the pool can be simulated on machines without GPUs.
+    """
+
+    def __init__(
+        self,
+        devices: Sequence[str] = (),
+        cpus: Optional[Sequence[int]] = None,
+        memory: Optional[float] = None,
+    ):
+        if cpus is None:
+            cpus = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else range(os.cpu_count() or 1)
+        self.devices = list(devices)
+        self.cpus = list(cpus)
+        self.memory = memory
+        self._free_devices = list(self.devices)
+        self._free_cpus = list(self.cpus)
+        self._free_memory = memory
+
+    def capacity(self, gpus: int, cpus: int, memory: float) -> int:
+        """The number of runs with these requirements that fit in the empty pool."""
+        limits = []
+        if gpus > 0:
+            limits.append(len(self.devices) // gpus)
+        if cpus > 0:
+            limits.append(len(self.cpus) // cpus)
+        if memory > 0 and self.memory is not None:
+            limits.append(int(self.memory // memory))
+        return min(limits) if limits else len(self.cpus)
+
+    def acquire(self, gpus: int, cpus: int, memory: float) -> Optional[Allocation]:
+        """Reserve resources for a run, or return None if they are not free."""
+        if len(self._free_devices) < gpus or len(self._free_cpus) < cpus:
+            return None
+        if self._free_memory is not None and self._free_memory < memory:
+            return None
+
+        allocation = Allocation(
+            devices=self._free_devices[:gpus], cpus=self._free_cpus[:cpus], memory=memory
+        )
+        self._free_devices = self._free_devices[gpus:]
+        self._free_cpus = self._free_cpus[cpus:]
+        if self._free_memory is not None:
+            self._free_memory -= memory
+        return allocation
+
+    def release(self, allocation: Allocation):
+        self._free_devices.extend(allocation.devices)
+        self._free_cpus.extend(allocation.cpus)
+        if self._free_memory is not None:
+            self._free_memory += allocation.memory
+
+
+def _execute_pinned(config: RunConfig, env: Dict[str, str], cpus: List[int]):
+    os.environ.update(env)
+    if cpus and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cpus)
+    return execute_config(config)
+
+
+@register_executor("local")
+class LocalExecutor(Executor):
+    """Schedules configs onto the devices, CPU cores and memory of this node without
+    Ray. Each run gets its own worker process, pinned to its devices (with 
+    `CUDA_VISIBLE_DEVICES`), CPU cores and thread count, and the next config starts
+    as soon as enough resources are free.
+
+    Parameters:
+        devices (Sequence[str]): The devices to schedule onto. Defaults to the 
+            devices in `CUDA_VISIBLE_DEVICES`.
+        gpus_per_config (int): The number of devices each run needs.
+        cpus_per_config (int): The number of CPU cores each run needs.
+        memory_per_config (float): The memory (in GB) each run needs. This is only
+            used for scheduling and is not enforced.
+        num_cpus (int): The number of CPU cores to use. Defaults to all available.
+        memory (float): The memory budget (in GB). Defaults to no budget.
+    """
+
+    def __init__(
+        self,
+        devices: Optional[Sequence[str]] = None,
+        gpus_per_config: int = 1,
+        cpus_per_config: int = 1,
+        memory_per_config: float = 0.0,
+        num_cpus: Optional[int] = None,
+        memory: Optional[float] = None,
+    ):
+        if devices is None:
+            visible = os.environ.get("CUDA_VISIBLE_DEVICES", "")
+            devices = [d for d in visible.split(",") if d]
+        if len(devices) == 0 and gpus_per_config > 0:
+            print("No devices found, scheduling configs on CPUs only.")
+            gpus_per_config = 0
+        cpus = None
+        if num_cpus is not None:
+            cpus = ResourcePool().cpus[:num_cpus]
+        self.resources = ResourcePool(devices=devices, cpus=cpus, memory=memory)
+        self.request = (gpus_per_config, cpus_per_config, memory_per_config)
+
+        num_workers = self.resources.capacity(*self.request)
+        if num_workers < 1:
+            raise ValueError(
+                f"A config needs {gpus_per_config} devices, {cpus_per_config} cpus and "
+                f"{memory_per_config}GB of memory, which is more than is available."
+            )
+
+        from concurrent import futures
+        self._futures = futures
+        # NOTE: each run gets a fresh process so that the devices are pinned before 
+        # anything (e.g. CUDA) is initialized. Before Python 3.11, pools can't replace
+        # their workers, so we start a single-use pool for each run instead
+        if sys.version_info >= (3, 11):
+            self._pool = futures.ProcessPoolExecutor(max_workers=num_workers, max_tasks_per_child=1)
+        else:
+            self._pool = None
+
+        self._next_handle = 0
+        self._queue = deque()
+        self._running = {}
+        self._done = {}
+
+    @classmethod
+    def from_args(cls, args: Namespace) -> Executor:
+        devices = getattr(args, "devices", None)
+        return cls(
+            devices=devices.split(",") if devices is not None else None,
+            gpus_per_config=getattr(args, "gpus_per_config", 1),
+            cpus_per_config=getattr(args, "cpus_per_config", 1),
+            memory_per_config=getattr(args, "memory_per_config", 0.0),
+            num_cpus=getattr(args, "num_cpus", None),
+            memory=getattr(args, "memory", None),
+        )
+
+    def _dispatch(self):
+        while self._queue:
+            allocation = self.resources.acquire(*self.request)
+            if allocation is None:
+                break
+            handle, config = self._queue.popleft()
+            pool = self._pool
+            if pool is None:
+                pool = self._futures.ProcessPoolExecutor(max_workers=1)
+            future = pool.submit(_execute_pinned, config, allocation.env(), allocation.cpus)
+            if pool is not self._pool:
+                # the worker exits once the run is done
+                pool.shutdown(wait=False)
+            self._running[future] = (handle, config, allocation)
+
+    def submit(self, config: RunConfig) -> Any:
+        handle = self._next_handle
+        self._next_handle += 1
+        self._queue.append((handle, config))
+        self._dispatch()
+        return handle
+
+    def wait(self, handles: List[Any]) -> Tuple[List[RunResult], List[Any]]:
+        while not any(handle in self._done for handle in handles):
+            if not self._running:
+                raise RuntimeError("Waiting on configs that were not submitted to this executor.")
+            complete, _ = self._futures.wait(self._running, return_when=self._futures.FIRST_COMPLETED)
+            for future in complete:
+                handle, config, allocation = self._running.pop(future)
+                self.resources.release(allocation)
+                try:
+                    self._done[handle] = future.result()
+                except Exception as e:
+                    # e.g. the worker process died or the output could not be pickled
+                    self._done[handle] = RunResult(config=config, error=e)
+            self._dispatch()
+        
+        results, pending = [], []
+        for handle in handles:
+            if handle in self._done:
+                results.append(self._done.pop(handle))
+            else:
+                pending.append(handle)
+        return results, pending
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown()
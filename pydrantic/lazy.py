@@ -0,0 +1,214 @@
+from __future__ import annotations
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from pydantic import ConfigDict, PydanticUserError, TypeAdapter, ValidationError
+from typing_extensions import Annotated
+
+from pydrantic.config import BaseConfig
+from pydrantic.utils import import_object, type_from_dict
+
+
+# the maximum number of (field annotation, model config) pairs kept with their adapters
+ADAPTER_CACHE_SIZE = 4096
+
+
+def _build_adapter(annotation: Any, config: ConfigDict) -> TypeAdapter:
+    # the field is validated with the config of its model (e.g. `arbitrary_types_allowed`),
+    # as `model_validate` would
+    try:
+        return TypeAdapter(annotation, config=config)
+    except PydanticUserError as e:
+        if e.code != "type-adapter-config-unused":
+            raise
+        # types with a config of their own (e.g. a subconfig) use it instead
+        return TypeAdapter(annotation)
+
+
+@lru_cache(maxsize=ADAPTER_CACHE_SIZE)
+def _cached_adapter(annotation: Any, config: Tuple[Tuple[str, Any], ...]) -> TypeAdapter:
+    # building adapters is expensive, and fields often share annotations
+    return _build_adapter(annotation, ConfigDict(config))
+
+
+def _field_adapter(cls: Type[BaseConfig], name: str) -> TypeAdapter:
+    field = cls.model_fields[name]
+    annotation = field.annotation
+    if field.metadata:
+        # e.g. constraints like `Field(gt=0)`
+        annotation = Annotated[(annotation, *field.metadata)]
+    config = tuple(sorted(cls.model_config.items()))
+    try:
+        hash((annotation, config))
+    except TypeError:
+        # e.g. unhashable metadata, which we can't cache
+        return _build_adapter(annotation, cls.model_config)
+    return _cached_adapter(annotation, config)
+
+
+def _is_config(v: Any) -> bool:
+    return isinstance(v, dict) and "_config_type" in v
+
+
+def _is_type(v: Any) -> bool:
+    return isinstance(v, dict) and "_is_type" in v
+
+
+def _contains_config(v: Any) -> bool:
+    if isinstance(v, list):
+        return any(_is_config(i) for i in v)
+    if isinstance(v, dict):
+        return any(_is_config(i) for i in v.values())
+    return False
+
+
+def _with_prefix(e: ValidationError, prefix: Tuple) -> List[Dict[str, Any]]:
+    return [{**error, "loc": (*prefix, *error["loc"])} for error in e.errors()]
+
+
+def _line_errors(errors: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # `from_exception_data` only takes these keys
+    return [
+        {
+            "type": error["type"],
+            "loc": error["loc"],
+            "input": error["input"],
+            **({"ctx": error["ctx"]} if "ctx" in error else {}),
+        }
+        for error in errors
+    ]
+
+
+class LazyConfig:
+    """A config loaded with `BaseConfig.from_dict(data, lazy=True)`, which validates
+    each field the first time it is accessed instead of validating the whole config
+    up front. Subconfigs are returned as lazy configs too, so reading a few values
+    from a large config only imports and validates what is read.
+
+    Fields are validated against their annotations (including constraints), and
+    raise the same `ValidationError`s as `model_validate` would for them. Field and
+    model validators only run in `validate_all`, which validates the whole config
+    and returns it as a regular `BaseConfig`.
+
+    Example:
+        config = TrainConfig.from_yaml("config.yaml", lazy=True)
+        config.model.num_layers  # only validates model.num_layers
+        config = config.validate_all()
+    """
+
+    def __init__(self, data: Dict, cls: Type[BaseConfig], strict: bool = True):
+        self._data = data
+        self._cls_hint = cls
+        self._strict = strict
+        self._config_cls: Optional[Type[BaseConfig]] = None
+        self._values: Dict[str, Any] = {}
+        self._validated: Optional[BaseConfig] = None
+
+    @property
+    def config_cls(self) -> Type[BaseConfig]:
+        """The class of the config, which is imported on first use."""
+        if self._config_cls is None:
+            cls = self._cls_hint
+            config_type = self._data.get("_config_type")
+            if isinstance(config_type, dict):
+                cls = type_from_dict(config_type)
+            elif config_type is not None:
+                # SE (12/14): Backwards compatibility for old configs before support for inner classes
+                cls = import_object(config_type)
+
+            unknown = [k for k in self._data if k != "_config_type" and k not in cls.model_fields]
+            if len(unknown) > 0:
+                if self._strict:
+                    raise ValueError(f"Missing fields: {', '.join(unknown)}")
+                print(f"Missing fields: {', '.join(unknown)}")
+            self._config_cls = cls
+        return self._config_cls
+
+    def _load(self, name: str) -> Any:
+        cls = self.config_cls
+        if name not in cls.model_fields:
+            raise AttributeError(f"`{cls.__name__}` has no field `{name}`")
+
+        if name in self._data:
+            value = self._data[name]
+        else:
+            field = cls.model_fields[name]
+            if field.is_required():
+                raise ValidationError.from_exception_data(
+                    cls.__name__, [{"type": "missing", "loc": (name,), "input": self._data}]
+                )
+            value = field.get_default(call_default_factory=True)
+
+        if _is_config(value):
+            # validating the subconfig is deferred to its own fields
+            return LazyConfig(value, BaseConfig, strict=self._strict)
+        if _is_type(value):
+            value = type_from_dict(value)
+        elif _contains_config(value):
+            if isinstance(value, list):
+                value = [BaseConfig.from_dict(i, strict=self._strict) if _is_config(i) else i for i in value]
+            else:
+                value = {
+                    k: BaseConfig.from_dict(v, strict=self._strict) if _is_config(v) else v
+                    for k, v in value.items()
+                }
+
+        try:
+            return _field_adapter(cls, name).validate_python(value, strict=self._strict)
+        except ValidationError as e:
+            # report the errors as `model_validate` would, under the model and field
+            raise ValidationError.from_exception_data(
+                cls.__name__, _line_errors(_with_prefix(e, (name,)))
+            ) from None
+
+    def __getattr__(self, name: str) -> Any:
+        # private and dunder attributes are never fields (e.g. lookups by copy or pickle)
+        if name.startswith("_"):
+            raise AttributeError(name)
+        if self._validated is not None:
+            return getattr(self._validated, name)
+        if name not in self._values:
+            self._values[name] = self._load(name)
+        return self._values[name]
+
+    def get(self, key, default=None):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            return default
+
+    def validate_all(self) -> BaseConfig:
+        """Validates the whole config, raising the validation errors of all of its 
+        fields at once, and returns it as a `BaseConfig`."""
+        if self._validated is not None:
+            return self._validated
+
+        cls = self.config_cls
+        values, errors = {}, []
+        for name in cls.model_fields:
+            if name not in self._data and not cls.model_fields[name].is_required():
+                # defaults are validated by `model_validate`
+                continue
+            try:
+                value = getattr(self, name)
+            except ValidationError as e:
+                errors.extend(e.errors())
+                continue
+            if isinstance(value, LazyConfig):
+                try:
+                    value = value.validate_all()
+                except ValidationError as e:
+                    errors.extend(_with_prefix(e, (name,)))
+                    continue
+            values[name] = value
+        if len(errors) > 0:
+            raise ValidationError.from_exception_data(cls.__name__, _line_errors(errors))
+
+        # this also runs the field and model validators
+        self._validated = cls.model_validate(values, strict=self._strict)
+        return self._validated
+
+    def __repr__(self) -> str:
+        name = self._config_cls.__name__ if self._config_cls is not None else "?"
+        loaded = ", ".join(f"{k}={v!r}" for k, v in self._values.items())
+        return f"LazyConfig[{name}]({loaded})"
@@ -0,0 +1,224 @@
+from __future__ import annotations
+import threading
+import typing
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type
+
+from pydantic import TypeAdapter, ValidationError
+
+from pydrantic.config import BaseConfig
+
+
+def _config_type_from_annotation(annotation: Any) -> Optional[Type[BaseConfig]]:
+    """Returns the config class of a field annotation if it can be determined
+    statically (e.g. `ModelConfig` or `Optional[ModelConfig]`), otherwise None.
+    """
+    if isinstance(annotation, type):
+        return annotation if issubclass(annotation, BaseConfig) else None
+    config_types = [
+        arg for arg in typing.get_args(annotation)
+        if isinstance(arg, type) and issubclass(arg, BaseConfig)
+    ]
+    if len(config_types) == 1:
+        return config_types[0]
+    return None
+
+
+def _is_config_annotation(annotation: Any) -> bool:
+    if isinstance(annotation, type):
+        return issubclass(annotation, BaseConfig)
+    # for unions, Any, etc. we can't tell until we see the value
+    return True
+
+
+def _coerce(annotation: Any, value: Any) -> Any:
+    # NOTE: we coerce with strict=False so that strings from the cli are converted
+    # once per plan instead of once per config. If coercion fails, we keep the raw
+    # value so that validating the config reports the error.
+    try:
+        return TypeAdapter(annotation).validate_python(value, strict=False)
+    except (ValidationError, TypeError, ValueError):
+        return value
+
+
+class OverridePlan:
+    """A set of overrides compiled against a config class, so that they can be
+    applied to many configs without re-parsing them.
+
+    Example:
+        plan = OverridePlan.from_updates(["lr=1e-4", "model.num_layers=4"], TrainConfig)
+        configs = plan.apply_many(configs)
+
+    Applying a plan costs one validation for each config node touched by the
+    overrides. Subconfigs shared between configs are only revalidated once per
+    call to `apply_many`.
+    """
+
+    def __init__(
+        self,
+        config_cls: Type[BaseConfig],
+        overrides: List[Tuple[Tuple[str, ...], Any]],
+        coerce: bool = True,
+        prefix: Tuple[str, ...] = (),
+    ):
+        self.config_cls = config_cls
+        self.overrides = overrides
+        self.coerce = coerce
+        self.prefix = prefix
+
+        fields = config_cls.model_fields
+        self._field_names = tuple(fields)
+        grouped: Dict[str, List[Tuple[Tuple[str, ...], Any]]] = {}
+        self.values: Dict[str, Any] = {}
+        # the full dotted path of each value, used to bind new values in `apply`
+        self.paths: Dict[str, str] = {}
+        for path, value in overrides:
+            key = path[0]
+            if key not in fields:
+                raise AttributeError(
+                    f"`{config_cls.__name__}` has no field `{key}` (in override `{'.'.join(path)}`)"
+                )
+            if len(path) == 1:
+                annotation = fields[key].annotation
+                self.values[key] = _coerce(annotation, value) if coerce else value
+                self.paths[key] = ".".join(prefix + path)
+            else:
+                if not _is_config_annotation(fields[key].annotation):
+                    raise AttributeError(f"Cannot override fields of `{key}`, it is not a config.")
+                grouped.setdefault(key, []).append((path[1:], value))
+
+        # plans for the subconfigs, compiled against the annotated type when it can
+        # be determined and otherwise against the type of the first value we see
+        self.children: Dict[str, Tuple[List[Tuple[Tuple[str, ...], Any]], Optional[OverridePlan]]] = {}
+        for key, child_overrides in grouped.items():
+            child_cls = _config_type_from_annotation(fields[key].annotation)
+            child_plan = None
+            if child_cls is not None:
+                try:
+                    child_plan = OverridePlan(
+                        child_cls, child_overrides, coerce=coerce, prefix=prefix + (key,)
+                    )
+                except AttributeError:
+                    # the value may be a subclass of the annotated type with more
+                    # fields, so we wait until we see it
+                    pass
+            self.children[key] = (child_overrides, child_plan)
+
+        self._plans_by_type: Dict[type, OverridePlan] = {config_cls: self}
+        # guards the plans compiled lazily, since a plan may be shared by threads (e.g. 
+        # when applied from the thread executor)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_updates(
+        cls,
+        updates: Iterable[str],
+        config_cls: Type[BaseConfig]
+    ) -> OverridePlan:
+        """Compile cli updates of the form `key.subkey=value`."""
+        overrides = []
+        for update in updates:
+            arg_path, value = update.split("=")
+            overrides.append((tuple(arg_path.split(".")), value))
+        return cls(config_cls, overrides)
+
+    @classmethod
+    def from_dict(
+        cls,
+        overrides: Dict[str, Any],
+        config_cls: Type[BaseConfig],
+        coerce: bool = True,
+    ) -> OverridePlan:
+        """Compile overrides given as a dict of dotted paths to values."""
+        return cls(
+            config_cls,
+            [(tuple(path.split(".")), value) for path, value in overrides.items()],
+            coerce=coerce,
+        )
+
+    def for_type(self, config_cls: Type[BaseConfig]) -> OverridePlan:
+        """Returns the plan compiled against `config_cls` (e.g. a subclass of the
+        annotated type)."""
+        plan = self._plans_by_type.get(config_cls)
+        if plan is None:
+            with self._lock:
+                plan = self._plans_by_type.get(config_cls)
+                if plan is None:
+                    plan = OverridePlan(
+                        config_cls, self.overrides, coerce=self.coerce, prefix=self.prefix
+                    )
+                    self._plans_by_type[config_cls] = plan
+        return plan
+
+    def _child_plan(self, key: str, child_cls: Type[BaseConfig]) -> OverridePlan:
+        """Compiles the plan for the subconfig `key` against the type of the first 
+        value we see, when it couldn't be determined from the annotation."""
+        with self._lock:
+            child_overrides, child_plan = self.children[key]
+            if child_plan is None:
+                child_plan = OverridePlan(
+                    child_cls, child_overrides, coerce=self.coerce, prefix=self.prefix + (key,)
+                )
+                self.children[key] = (child_overrides, child_plan)
+        return child_plan
+
+    def _apply(
+        self, 
+        config: BaseConfig, 
+        memo: Optional[Dict], 
+        values: Optional[Dict[str, Any]] = None
+    ) -> BaseConfig:
+        if type(config) is not self.config_cls:
+            return self.for_type(type(config))._apply(config, memo, values)
+
+        # we are careful not to use model_dump() because it will also serialize
+        # the nested configs
+        data = {k: getattr(config, k) for k in self._field_names}
+        for key, (child_overrides, child_plan) in self.children.items():
+            child = data[key]
+            if not isinstance(child, BaseConfig):
+                raise AttributeError(f"Cannot override fields of `{key}`, it is not a config.")
+            if child_plan is None:
+                child_plan = self._child_plan(key, type(child))
+
+            # configs in a sweep often share the same subconfig objects, so we only
+            # revalidate each (subconfig, plan) pair once
+            if memo is None:
+                data[key] = child_plan._apply(child, memo, values)
+            else:
+                memo_key = (id(child), id(child_plan))
+                if memo_key not in memo:
+                    memo[memo_key] = (child, child_plan._apply(child, memo))
+                data[key] = memo[memo_key][1]
+
+        if config._variables is not None:
+            data.update(config._variables)
+        if values is None:
+            data.update(self.values)
+        else:
+            data.update({key: values[path] for key, path in self.paths.items()})
+
+        # NOTE: we use strict=False so that any values that could not be coerced
+        # when compiling the plan are coerced here
+        return self.config_cls.model_validate(data, strict=False)
+
+    def apply(self, config: BaseConfig, values: Optional[Dict[str, Any]] = None) -> BaseConfig:
+        """Returns a new config with the overrides applied.
+
+        Parameters:
+            config (BaseConfig): The config to override.
+            values (Dict[str, Any]): Optionally, new values for the paths in the plan, 
+                keyed by dotted path. These are used in place of the values the plan 
+                was compiled with and are not pre-coerced. This lets one plan apply
+                many different points in a sweep.
+        """
+        if len(self.overrides) == 0:
+            return config
+        return self._apply(config, memo=None, values=values)
+
+    def apply_many(self, configs: Iterable[BaseConfig]) -> List[BaseConfig]:
+        """Returns new configs with the overrides applied to each of `configs`."""
+        configs = list(configs)
+        if len(self.overrides) == 0:
+            return configs
+        memo = {}
+        return [self._apply(config, memo) for config in configs]
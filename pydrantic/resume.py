@@ -0,0 +1,55 @@
+import os
+import json
+from typing import Dict, Optional, Set
+
+
+STATUS_FILE = "status.json"
+
+
+def write_status(run_dir: str, fingerprint: str, error: Optional[Exception] = None, wall_time: Optional[float] = None):
+    """Write a marker in the run_dir recording whether the run completed."""
+    status = {
+        "status": "failed" if error is not None else "completed",
+        "fingerprint": fingerprint,
+        "wall_time": wall_time,
+    }
+    if error is not None:
+        status["error"] = repr(error)
+    with open(os.path.join(run_dir, STATUS_FILE), "w") as f:
+        json.dump(status, f)
+
+
+def read_status(run_dir: str) -> Optional[Dict]:
+    path = os.path.join(run_dir, STATUS_FILE)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except json.JSONDecodeError:
+        # e.g. the launch was killed while writing the marker
+        return None
+
+
+def completed_fingerprints(launch_dir: str) -> Set[str]:
+    """The fingerprints of the configs that completed in a launch directory."""
+    hashes = set()
+    if not os.path.isdir(launch_dir):
+        return hashes
+    for run_id in os.listdir(launch_dir):
+        status = read_status(os.path.join(launch_dir, run_id))
+        if status is not None and status.get("status") == "completed":
+            hashes.add(status["fingerprint"])
+    return hashes
+
+
+def latest_launch_id(output_dir: str, script_id: str) -> Optional[str]:
+    """The most recent launch of a script in `output_dir`. Launch ids start with a
+    timestamp, so they sort chronologically."""
+    if not os.path.isdir(output_dir):
+        return None
+    launch_ids = [
+        name for name in os.listdir(output_dir)
+        if name.endswith(f"-{script_id}") and os.path.isdir(os.path.join(output_dir, name))
+    ]
+    return max(launch_ids) if launch_ids else None
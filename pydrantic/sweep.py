@@ -0,0 +1,166 @@
+from __future__ import annotations
+import itertools
+import math
+import random
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from pydrantic.config import BaseConfig
+from pydrantic.overrides import OverridePlan
+
+
+def logspace(start: float, stop: float, num: int, base: float = 10.0) -> List[float]:
+    """`num` values spaced evenly on a log scale from `base ** start` to `base ** stop`
+    (like `np.logspace`)."""
+    if num == 1:
+        return [base ** start]
+    step = (stop - start) / (num - 1)
+    return [base ** (start + i * step) for i in range(num)]
+
+
+def linspace(start: float, stop: float, num: int) -> List[float]:
+    """`num` evenly spaced values from `start` to `stop` (like `np.linspace`)."""
+    if num == 1:
+        return [start]
+    step = (stop - start) / (num - 1)
+    return [start + i * step for i in range(num)]
+
+
+class Distribution(ABC):
+    @abstractmethod
+    def sample(self, rng: random.Random) -> Any:
+        pass
+
+
+class Uniform(Distribution):
+    def __init__(self, low: float, high: float):
+        self.low = low
+        self.high = high
+
+    def sample(self, rng: random.Random) -> float:
+        return rng.uniform(self.low, self.high)
+
+
+class LogUniform(Distribution):
+    def __init__(self, low: float, high: float):
+        if low <= 0 or high <= 0:
+            raise ValueError("LogUniform bounds must be positive.")
+        self.low = low
+        self.high = high
+
+    def sample(self, rng: random.Random) -> float:
+        return math.exp(rng.uniform(math.log(self.low), math.log(self.high)))
+
+
+class Choice(Distribution):
+    def __init__(self, values: Sequence[Any]):
+        self.values = list(values)
+
+    def sample(self, rng: random.Random) -> Any:
+        return rng.choice(self.values)
+
+
+class Sweep:
+    """Generates variants of a base config by overriding fields along one or more
+    axes. Axes are given as dotted paths to fields (e.g. `"model.num_layers"`).
+
+    Example:
+        sweep = (
+            Sweep(TrainConfig(epochs=20))
+            .grid(lr=logspace(-4, -2, 10), batch_size=[128, 256])
+            .zip({"model.num_layers": [2, 4], "model.hidden_dim": [256, 512]})
+            .random(5, rng_seed=0, dropout=Uniform(0.0, 0.5))
+        )
+        pydrantic.main(sweep)
+
+    Each call adds a block of points and the sweep is the cartesian product of
+    its blocks. The axes dict is positional-only, so any field name (e.g. `axes`
+    or `seed`) can be passed as a keyword axis. The base config is validated once and each variant is derived
+    from it by revalidating only the subconfigs touched by its overrides, so
+    untouched subconfigs are shared between variants. A `Sweep` is a lazy
+    iterable, so it can be passed to `pydrantic.main` directly.
+    """
+
+    def __init__(self, base: BaseConfig):
+        self.base = base
+        self._blocks: List[List[Dict[str, Any]]] = []
+
+    @staticmethod
+    def _merge_axes(axes: Optional[Dict[str, Any]], kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        axes = {**(axes or {}), **kwargs}
+        if len(axes) == 0:
+            raise ValueError("At least one axis must be provided.")
+        return axes
+
+    def grid(self, axes: Optional[Dict[str, Sequence[Any]]] = None, /, **kwargs) -> Sweep:
+        """Add the cartesian product of the values of each axis."""
+        axes = self._merge_axes(axes, kwargs)
+        keys = list(axes.keys())
+        self._blocks.append([
+            dict(zip(keys, values))
+            for values in itertools.product(*[list(v) for v in axes.values()])
+        ])
+        return self
+
+    def zip(self, axes: Optional[Dict[str, Sequence[Any]]] = None, /, **kwargs) -> Sweep:
+        """Add the values of each axis paired elementwise. All axes must have the
+        same length."""
+        axes = self._merge_axes(axes, kwargs)
+        columns = {k: list(v) for k, v in axes.items()}
+        lengths = {len(v) for v in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(
+                f"All zipped axes must have the same length, got: "
+                f"{', '.join(f'{k}={len(v)}' for k, v in columns.items())}"
+            )
+        keys = list(columns.keys())
+        self._blocks.append([dict(zip(keys, values)) for values in zip(*columns.values())])
+        return self
+
+    def random(
+        self,
+        num_samples: int,
+        axes: Optional[Dict[str, Any]] = None,
+        /,
+        *,
+        rng_seed: Optional[int] = None,
+        **kwargs
+    ) -> Sweep:
+        """Add `num_samples` points sampled independently for each axis. Axes can
+        be a `Distribution` or a sequence of values to choose from. `rng_seed` seeds
+        the sampling (so that e.g. `seed` can be swept as an axis)."""
+        axes = self._merge_axes(axes, kwargs)
+        axes = {
+            k: v if isinstance(v, Distribution) else Choice(v) for k, v in axes.items()
+        }
+        rng = random.Random(rng_seed)
+        self._blocks.append([
+            {k: dist.sample(rng) for k, dist in axes.items()}
+            for _ in range(num_samples)
+        ])
+        return self
+
+    def points(self) -> Iterator[Dict[str, Any]]:
+        """The overrides for each variant in the sweep."""
+        for combination in itertools.product(*self._blocks):
+            point = {}
+            for values in combination:
+                point.update(values)
+            yield point
+
+    def __len__(self) -> int:
+        return math.prod(len(block) for block in self._blocks)
+
+    def __iter__(self) -> Iterator[BaseConfig]:
+        # every point overrides the same paths, so we compile the plan once and bind
+        # each point's values when applying it
+        plan = None
+        for point in self.points():
+            if plan is None:
+                # NOTE: sweep values are python objects rather than strings, so we 
+                # leave the coercion to the validation of the touched subconfigs
+                plan = OverridePlan.from_dict(point, type(self.base), coerce=False)
+            yield plan.apply(self.base, values=point)
+
+    def to_list(self) -> List[BaseConfig]:
+        return list(self)
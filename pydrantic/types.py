@@ -1,10 +1,47 @@
-from typing import Any
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 from pydantic import ValidationInfo, GetCoreSchemaHandler
 from pydantic import Field
 from pydantic_core import core_schema
 import string
 from typing_extensions import Annotated
 
+from pydrantic.variables import TEMPLATE_CACHE_SIZE
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def _compile_format_str(template: str) -> Optional[List[Tuple[str, Optional[str], str, Optional[str]]]]:
+    """Parses a format string into (literal, field, spec, conversion) parts. Returns
+    None if the template uses anything but plain field names (e.g. attributes, 
+    indices or nested fields), in which case we fall back to `str.format`."""
+    try:
+        parts = list(string.Formatter().parse(template))
+    except ValueError:
+        return None
+    for _, field, spec, _ in parts:
+        if field is not None and (not field.isidentifier() or "{" in spec):
+            return None
+    return parts
+
+
+def _format(template: str, data: Dict[str, Any]) -> str:
+    parts = _compile_format_str(template)
+    if parts is None:
+        return template.format(**data)
+    out = []
+    for literal, field, spec, conversion in parts:
+        out.append(literal)
+        if field is not None:
+            value = data[field]
+            if conversion == "r":
+                value = repr(value)
+            elif conversion == "s":
+                value = str(value)
+            elif conversion == "a":
+                value = ascii(value)
+            out.append(format(value, spec))
+    return "".join(out)
+
 
 class FormatStr(Annotated[str, Field(validate_default=True)]):
 
@@ -17,7 +54,6 @@ class FormatStr(Annotated[str, Field(validate_default=True)]):
         if not isinstance(v, str):
             raise TypeError('string required')
         try:
-            return v.format(**info.data)
+            return _format(v, info.data)
         except KeyError as e:
             raise ValueError(f"Invalid field in format string: {e}")
-        
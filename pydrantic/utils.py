@@ -1,8 +1,11 @@
+import copy
 import importlib
+import json
+from functools import lru_cache
+import math
 from pathlib import Path
-import yaml
-import dill
 import pickle
+import threading
 
 
 class _Required:
@@ -15,14 +18,59 @@ REQUIRED = _Required()
 
 
 class literal_unicode(str):
+    # NOTE: the representer is registered with yaml on the first call to `_yaml_dumpers`
+    # (e.g. by `save_yaml`), not when pydrantic is imported
     pass
 
 
 def literal_unicode_representer(dumper, data):
-    return dumper.represent_scalar("tag:yaml.org,2002:str", data, style="|")
+    # NOTE: the C emitter only accepts exact strings
+    return dumper.represent_scalar("tag:yaml.org,2002:str", str(data), style="|")
 
 
-yaml.add_representer(literal_unicode, literal_unicode_representer)
+@lru_cache(maxsize=None)
+def _yaml_dumpers():
+    """The yaml dumpers, `(YamlDumper, _LiteralYamlDumper)`. They are built on first 
+    use so that importing pydrantic doesn't import yaml."""
+    import yaml
+
+    yaml.add_representer(literal_unicode, literal_unicode_representer)
+
+    # the C emitter is much faster than the pure python one, but is only available if
+    # pyyaml was built with libyaml
+    class YamlDumper(getattr(yaml, "CDumper", yaml.Dumper)):
+        """Dumps yaml with the C emitter when it is available. The output is the same
+        as with `yaml.Dumper`."""
+
+        def represent_scalar(self, tag, value, style=None):
+            # the python emitter quotes empty scalars (e.g. `!!python/name:builtins.int ''`)
+            # where the C emitter leaves them bare
+            if value == "" and style is None:
+                style = "'"
+            return super().represent_scalar(tag, value, style)
+
+    YamlDumper.add_representer(literal_unicode, literal_unicode_representer)
+
+    class _LiteralYamlDumper(YamlDumper):
+        """Dumps the output of `_transform_into_literals`, which shares unchanged dicts 
+        and lists with the input. `transform_into_literals` copies every dict and list, so 
+        we don't emit aliases for them."""
+
+        def ignore_aliases(self, data):
+            return type(data) is dict or type(data) is list or super().ignore_aliases(data)
+
+    YamlDumper.__qualname__ = "YamlDumper"
+    _LiteralYamlDumper.__qualname__ = "_LiteralYamlDumper"
+    return YamlDumper, _LiteralYamlDumper
+
+
+def __getattr__(name: str):
+    # PEP 562: `YamlDumper` is built on first access (see `_yaml_dumpers`)
+    if name == "YamlDumper":
+        return _yaml_dumpers()[0]
+    if name == "_LiteralYamlDumper":
+        return _yaml_dumpers()[1]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def transform_into_literals(data):
@@ -40,7 +88,38 @@ def transform_into_literals(data):
         return data
 
 
+def _transform_into_literals(data):
+    """Like `transform_into_literals`, but only copies the dicts and lists that 
+    contain multi-line strings (and dict and list subclasses, which are converted)."""
+    if type(data) is dict:
+        out = None
+        for k, v in data.items():
+            transformed = _transform_into_literals(v)
+            if transformed is not v and out is None:
+                out = dict(data)
+            if out is not None:
+                out[k] = transformed
+        return data if out is None else out
+    elif type(data) is list:
+        out = None
+        for i, x in enumerate(data):
+            transformed = _transform_into_literals(x)
+            if transformed is not x and out is None:
+                out = list(data)
+            if out is not None:
+                out[i] = transformed
+        return data if out is None else out
+    elif isinstance(data, (dict, list)):
+        return transform_into_literals(data)
+    elif isinstance(data, str) and "\n" in data:
+        return literal_unicode(data)
+    else:
+        return data
+
+
 def load_yaml(path: Path):
+    import yaml
+
     with open(path, "r") as f:
         data = yaml.load(f, Loader=yaml.CLoader)
 
@@ -49,17 +128,23 @@ def load_yaml(path: Path):
 
 def save_yaml(data, path: Path, sort_keys=True, transform=True):
     if transform:
-        data = transform_into_literals(data)
+        data = _transform_into_literals(data)
 
+    import yaml
+
+    yaml_dumper, literal_yaml_dumper = _yaml_dumpers()
     with open(path, "w") as f:
         yaml.dump(
             data,
             f,
+            Dumper=literal_yaml_dumper if transform else yaml_dumper,
             sort_keys=sort_keys,
         )
 
 
 def load_dill(path: Path):
+    import dill
+
     with open(path, "rb") as f:
         data = dill.load(f)
 
@@ -67,6 +152,8 @@ def load_dill(path: Path):
 
 
 def save_dill(data, path: Path):
+    import dill
+
     with open(path, "wb") as f:
         dill.dump(data, f)
 
@@ -83,13 +170,208 @@ def save_pickle(data, path: Path):
         pickle.dump(data, f)
 
 
+# JSON and msgpack can't represent tuples or integers wider than 64 bits, and JSON 
+# can't represent non-finite floats or dicts with non-string keys, so we encode these 
+# like types (see `type_to_dict`)
+_TUPLE_TAG = "_is_tuple"
+_INT_TAG = "_is_int"
+_FLOAT_TAG = "_is_float"
+_DICT_TAG = "_is_dict"
+
+
+def _encode(data, str_keys: bool):
+    """Tags the values JSON or msgpack can't represent. Only copies the dicts and
+    lists that contain such values."""
+    if type(data) is dict:
+        out = None
+        for k, v in data.items():
+            encoded = _encode(v, str_keys)
+            if encoded is not v and out is None:
+                out = dict(data)
+            if out is not None:
+                out[k] = encoded
+        data = data if out is None else out
+        if str_keys and not all(type(k) is str for k in data):
+            return {_DICT_TAG: True, "_items": [[_encode(k, str_keys), v] for k, v in data.items()]}
+        return data
+    elif type(data) is list:
+        out = None
+        for i, x in enumerate(data):
+            encoded = _encode(x, str_keys)
+            if encoded is not x and out is None:
+                out = list(data)
+            if out is not None:
+                out[i] = encoded
+        return data if out is None else out
+    elif isinstance(data, tuple):
+        return {_TUPLE_TAG: True, "_items": [_encode(x, str_keys) for x in data]}
+    elif isinstance(data, int) and not isinstance(data, bool) and not -2**63 <= data < 2**63:
+        return {_INT_TAG: True, "_value": str(data)}
+    elif isinstance(data, float) and str_keys and not math.isfinite(data):
+        return {_FLOAT_TAG: True, "_value": str(float(data))}
+    elif isinstance(data, dict):
+        return _encode(dict(data), str_keys)
+    elif isinstance(data, list):
+        return _encode(list(data), str_keys)
+    return data
+
+
+def _decode(data):
+    if type(data) is dict:
+        if _TUPLE_TAG in data:
+            return tuple(_decode(x) for x in data["_items"])
+        if _INT_TAG in data:
+            return int(data["_value"])
+        if _FLOAT_TAG in data:
+            return float(data["_value"])
+        if _DICT_TAG in data:
+            return {_decode(k): _decode(v) for k, v in data["_items"]}
+        for k, v in data.items():
+            data[k] = _decode(v)
+    elif type(data) is list:
+        for i, x in enumerate(data):
+            data[i] = _decode(x)
+    return data
+
+
+def dump_json(data) -> bytes:
+    """Serializes data to JSON, using orjson when it is installed."""
+    data = _encode(data, str_keys=True)
+    try:
+        import orjson
+    except ImportError:
+        return json.dumps(data, allow_nan=False).encode()
+    return orjson.dumps(data)
+
+
+def parse_json(content: bytes):
+    try:
+        import orjson
+    except ImportError:
+        return _decode(json.loads(content))
+    return _decode(orjson.loads(content))
+
+
+def load_json(path: Path):
+    with open(path, "rb") as f:
+        return parse_json(f.read())
+
+
+def save_json(data, path: Path):
+    content = dump_json(data)
+    with open(path, "wb") as f:
+        f.write(content)
+
+
+def load_msgpack(path: Path):
+    import msgpack
+    with open(path, "rb") as f:
+        data = msgpack.unpackb(f.read(), strict_map_key=False)
+    return _decode(data)
+
+
+def save_msgpack(data, path: Path):
+    import msgpack
+    content = msgpack.packb(_encode(data, str_keys=False))
+    with open(path, "wb") as f:
+        f.write(content)
+
+
+def _is_msgpack_map(content: bytes) -> bool:
+    # a fixmap, map 16 or map 32
+    return len(content) > 0 and (0x80 <= content[0] <= 0x8f or content[0] in (0xde, 0xdf))
+
+
+def _is_pickle(content: bytes) -> bool:
+    # pickles since protocol 2 start with the PROTO opcode and the protocol version
+    return len(content) > 1 and content[0] == 0x80 and 2 <= content[1] <= 5
+
+
 def load_binary(path: Path):
+    """Loads data saved with `save_dill`, `save_pickle`, `save_json` or 
+    `save_msgpack`. The format is determined by the extension and, failing that, by
+    the content of the file. Pickles are only loaded by extension, since loading
+    them can run arbitrary code."""
+    path = Path(path)
     if path.suffix == ".dill":
         return load_dill(path)
     elif path.suffix == ".pkl":
         return load_pickle(path)
-    else:
-        raise ValueError(f"Unknown extension {path.suffix}")
+    elif path.suffix == ".json":
+        return load_json(path)
+    elif path.suffix == ".msgpack":
+        return load_msgpack(path)
+
+    with open(path, "rb") as f:
+        content = f.read()
+    if _is_pickle(content):
+        raise ValueError(
+            f"{path} looks like a pickle, use a `.pkl` or `.dill` extension to load it."
+        )
+    if content.lstrip()[:1] in (b"{", b"["):
+        return parse_json(content)
+    if _is_msgpack_map(content):
+        import msgpack
+        return _decode(msgpack.unpackb(content, strict_map_key=False))
+    raise ValueError(f"Unknown extension {path.suffix}")
+
+
+# the maximum number of (module, qualname) pairs kept resolved
+IMPORT_CACHE_SIZE = 4096
+
+
+def _import(module_name: str, qualname: str):
+    module = importlib.import_module(module_name.replace("olive", "haystacks"))
+    obj = module
+    # support for inner classes
+    for part in qualname.split("."):
+        obj = getattr(obj, part)
+    return obj
+
+
+# the error of a miss that was just cached, which the thread that imported it raises
+_first_miss = threading.local()
+
+
+@lru_cache(maxsize=IMPORT_CACHE_SIZE)
+def _cached_import(module_name: str, qualname: str):
+    try:
+        return _import(module_name, qualname), None
+    except (ImportError, AttributeError) as e:
+        # we also remember missing objects, since failed imports search the whole path.
+        # NOTE: we cache a copy without the traceback, which would keep the frames (and 
+        # the data being loaded) of the first caller alive
+        _first_miss.error = e
+        return None, copy.copy(e).with_traceback(None)
+
+
+def _resolve_object(module_name: str, qualname: str):
+    """Imports `module_name` and returns the object at `qualname` in it, caching the 
+    result (or the error) for each pair. Objects in `__main__` are not cached, since 
+    e.g. notebooks redefine them."""
+    if module_name == "__main__":
+        return _import(module_name, qualname)
+    obj, error = _cached_import(module_name, qualname)
+    if error is not None:
+        first, _first_miss.error = getattr(_first_miss, "error", None), None
+        if first is not None:
+            raise first
+        # a copy, so that callers (e.g. in other threads) don't share the error's 
+        # traceback and context
+        raise copy.copy(error)
+    return obj
+
+
+def import_cache_info():
+    """The hits, misses and size of the cache used by `import_object` and 
+    `type_from_dict`, as for `functools.lru_cache`."""
+    return _cached_import.cache_info()
+
+
+def clear_import_cache():
+    """Clears the cache used by `import_object` and `type_from_dict`, e.g. after 
+    reloading a module or making a missing module importable."""
+    _cached_import.cache_clear()
 
 
 def import_object(name: str):
@@ -101,10 +383,8 @@ def import_object(name: str):
     Returns:
     - object: The imported object.
     """
-    import importlib
     module_name, obj_name = name.rsplit('.', 1)
-    module = importlib.import_module(module_name.replace("olive", "haystacks"))
-    return getattr(module, obj_name)
+    return _resolve_object(module_name, obj_name)
 
 def type_to_dict(cls): 
     return {
@@ -116,15 +396,7 @@ def type_to_dict(cls):
 def type_from_dict(d: dict):
     assert "_is_type" in d, "Invalid class dictionary"
     if "_module" in d and "_qualname" in d:
-        module = importlib.import_module(d["_module"].replace("olive", "haystacks"))
-        if "." in d["_qualname"]:
-            # support for inner classes
-            obj = module    
-            for part in d["_qualname"].split("."):
-                obj = getattr(obj, part)
-            return obj
-        else:
-            return getattr(module, d["_qualname"])
+        return _resolve_object(d["_module"], d["_qualname"])
     elif "_name" in d:
         # SE (12/14): Backwards compatibility for old configs before support for inner classes
         return import_object(d["_name"])
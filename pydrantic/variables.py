@@ -1,29 +1,143 @@
 
-from typing import Any
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 from abc import ABC, abstractmethod
-from pydrantic.utils import flatten_dict
 
 class BaseVariable(ABC):
     @abstractmethod
     def resolve(self, data: dict[str, Any]):
         pass
 
+    def dependencies(self) -> Optional[List[str]]:
+        """The keys of the data that the variable may reference, used to resolve the
+        variables of a config in dependency order. Returns None if they are not known,
+        in which case resolving is retried until it no longer raises a 
+        `VariableResolutionError`."""
+        return None
+
 class VariableResolutionError(ValueError):
     pass
 
-class FormatStringVariable(BaseVariable):
+
+_MISSING = object()
+
+
+def _compile_path(reference: str) -> Tuple[Tuple[Tuple[int, str], ...], ...]:
+    """For each part of a dotted reference, the keys that can start at that part 
+    (with the index of the part after them), from the longest to the shortest."""
+    parts = reference.split(".")
+    return tuple(
+        tuple((j, ".".join(parts[i:j])) for j in range(len(parts), i, -1))
+        for i in range(len(parts))
+    )
+
+
+def _child(obj: Any, key: str) -> Any:
+    from pydrantic.config import BaseConfig
+    from pydrantic.utils import type_to_dict
+
+    if isinstance(obj, BaseConfig):
+        if key == "_config_type":
+            return type_to_dict(type(obj))
+        return obj.__dict__.get(key, _MISSING)
+    if isinstance(obj, type):
+        obj = type_to_dict(obj)
+    if isinstance(obj, dict):
+        value = obj.get(key, _MISSING)
+        if value is _MISSING and key.isdigit():
+            value = obj.get(int(key), _MISSING)
+        return value
+    if isinstance(obj, list) and key.isdigit() and int(key) < len(obj):
+        return obj[int(key)]
+    return _MISSING
+
+
+def _lookup(obj: Any, path: Tuple[Tuple[Tuple[int, str], ...], ...], start: int = 0) -> Any:
+    """Looks up a dotted reference the way it would be found in the flattened data
+    (see `flatten_dict`), without flattening it. Keys that contain dots take
+    precedence over nested keys, and only leaf values are found. Types are leaves, 
+    unless the reference goes further into them (e.g. `cls._qualname`)."""
+    from pydrantic.config import BaseConfig
+
+    if start == len(path):
+        if isinstance(obj, (BaseConfig, dict, list)):
+            return _MISSING
+        return obj
+    for end, key in path[start]:
+        value = _child(obj, key)
+        if value is not _MISSING:
+            value = _lookup(value, path, end)
+            if value is not _MISSING:
+                return value
+    return _MISSING
+
+
+# the maximum number of distinct templates kept compiled
+TEMPLATE_CACHE_SIZE = 4096
+
+
+class _CompiledTemplate:
+    """The parsed form of a `FormatStringVariable` template, shared by all variables 
+    with the same template (see `_compile_template`)."""
+
     def __init__(self, template: str):
         import re
+        self.source = template
         self.references = re.findall(r'\{(.*?)\}', template)
-        self.template = template.replace("{", "{0[").replace("}", "]}")
+        self.format_template = template.replace("{", "{0[").replace("}", "]}")
+        # the lookup path of each reference, so that we only walk the referenced
+        # values when resolving
+        self.paths: List[Tuple[str, Tuple[Tuple[Tuple[int, str], ...], ...]]] = [
+            (k, _compile_path(k)) for k in dict.fromkeys(self.references)
+        ]
+        # a reference like `a.b.c` may start with the key `a`, `a.b` or `a.b.c`
+        self.dependencies = list(dict.fromkeys(
+            key for _, path in self.paths for _, key in path[0]
+        ))
+        # the literal text around the references, unless there are unmatched 
+        # braces, which we leave to `str.format` to report
+        parts = re.split(r'\{(.*?)\}', template)
+        literals = parts[::2]
+        if any(c in part for part in parts for c in "{}") or any(c in k for k in self.references for c in "[]"):
+            self.literals = None
+        else:
+            self.literals = literals
+
+    def format(self, values: Dict[str, Any]) -> str:
+        if self.literals is None:
+            return self.format_template.format(values)
+        out = [self.literals[0]]
+        for k, literal in zip(self.references, self.literals[1:]):
+            out.append(format(values[k]))
+            out.append(literal)
+        return "".join(out)
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def _compile_template(template: str) -> _CompiledTemplate:
+    return _CompiledTemplate(template)
+
+
+class FormatStringVariable(BaseVariable):
+    def __init__(self, template: str):
+        self._compiled = _compile_template(template)
+        self.references = self._compiled.references
+        self.template = self._compiled.format_template
+
+    def __reduce__(self):
+        # unpickled variables share the compiled template too
+        return (FormatStringVariable, (self._compiled.source,))
+
+    def dependencies(self) -> List[str]:
+        return self._compiled.dependencies
 
 
     def resolve(self, data: dict[str, Any]) -> str:
-        from pydrantic.config import BaseConfig
-        data = {k: v.to_dict() if isinstance(v, BaseConfig) else v for k, v in data.items()}
-        data = flatten_dict(data, sep=".")
-        for k in self.references:
-            v = data.get(k)
+        values = {}
+        for k, path in self._compiled.paths:
+            v = _lookup(data, path)
             if isinstance(v, BaseVariable) and v is not self:
                 raise VariableResolutionError(f"Unsupported dependency between Pydrantic variables: {self.template}, {v}")
-        return self.template.format(data)
+            if v is not _MISSING:
+                values[k] = v
+        return self._compiled.format(values)
@@ -0,0 +1,46 @@
+import os
+import time
+
+from pydrantic.cache import DiskCache
+from pydrantic.cli import launch
+from pydrantic.config import RunConfig
+
+
+class CountingConfig(RunConfig):
+    x: int = 0
+
+    def run(self):
+        return {"x": self.x, "pid": os.getpid(), "time": time.time()}
+
+
+def test_disk_cache_roundtrip(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    assert cache.get("abc") == (False, None)
+    cache.set("abc", {"loss": 0.1})
+    assert cache.get("abc") == (True, {"loss": 0.1})
+    # a new cache over the same directory sees the entries
+    assert DiskCache(str(tmp_path)).get("abc") == (True, {"loss": 0.1})
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path):
+    cache = DiskCache(str(tmp_path), max_size=2500)
+    for idx, key in enumerate(["aa", "bb"]):
+        cache.set(key, b"x" * 1000)
+        os.utime(cache._entry_path(key), (idx, idx))
+    cache.get("aa")  # "bb" is now the least recently used
+    cache.set("cc", b"x" * 1000)
+    assert cache.get("bb") == (False, None)
+    assert cache.get("aa")[0] and cache.get("cc")[0]
+
+
+def test_launch_uses_cache(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache"))
+    first = launch([CountingConfig(x=1, run_id="a"), CountingConfig(x=2, run_id="b")], cache=cache).results()
+    assert not any(result.cached for result in first)
+
+    # run identity fields are not part of the key
+    handle = launch([CountingConfig(x=1, run_id="c"), CountingConfig(x=3)], cache=cache)
+    second = handle.results()
+    assert [result.cached for result in second] == [True, False]
+    assert second[0].output == first[0].output
+    assert handle.num_cached == 1
@@ -0,0 +1,60 @@
+import os
+
+import pytest
+
+from pydrantic.catalog import find_runs, iter_rows, load_runs
+from pydrantic.config import RunConfig
+from pydrantic.resume import write_status
+
+
+class CatalogConfig(RunConfig):
+    lr: float = 1e-3
+    betas: tuple = (0.9, 0.999)
+
+    def run(self):
+        pass
+
+
+def _write_runs(output_dir, launch_id, num_runs, fmt="yaml"):
+    configs = []
+    for idx in range(num_runs):
+        run_dir = os.path.join(output_dir, launch_id, f"run-{idx}")
+        config = CatalogConfig(lr=idx * 0.1, run_dir=run_dir, launch_id=launch_id)
+        os.makedirs(run_dir)
+        getattr(config, f"to_{fmt}")(os.path.join(run_dir, f"config.{fmt}"))
+        write_status(run_dir, config.fingerprint(), wall_time=float(idx))
+        configs.append(config)
+    return configs
+
+
+@pytest.mark.parametrize("executor,num_workers", [("thread", 0), ("thread", 4), ("process", 2)])
+def test_load_runs(tmp_path, executor, num_workers):
+    configs = _write_runs(str(tmp_path), "launch-a", 5) + _write_runs(str(tmp_path), "launch-b", 3, fmt="json")
+    # directories without a config are not runs
+    os.makedirs(tmp_path / "launch-b" / "empty")
+
+    runs = load_runs(str(tmp_path), num_workers=num_workers, executor=executor)
+    assert [run.config for run in runs] == configs
+    assert all(run.error is None for run in runs)
+    assert runs[1].row["lr"] == 0.1
+    assert runs[1].row["_status"] == "completed"
+    assert runs[1].row["_wall_time"] == 1.0
+    assert runs[1].row["_run_dir"] == configs[1].run_dir
+
+    runs = load_runs(str(tmp_path), launch_id="launch-b", num_workers=num_workers, executor=executor)
+    assert [run.config for run in runs] == configs[5:]
+
+
+def test_iter_rows_does_not_build_configs(tmp_path):
+    configs = _write_runs(str(tmp_path), "launch", 3)
+    with open(os.path.join(configs[2].run_dir, "config.yaml"), "w") as f:
+        f.write("lr: [")
+
+    rows = list(iter_rows(str(tmp_path), num_workers=2))
+    assert [row["lr"] for row in rows[:2]] == [0.0, 0.1]
+    assert rows[0]["_config_type._qualname"] == "CatalogConfig"
+    assert set(rows[2]) == {"_run_dir", "_error"}
+
+    runs = load_runs(str(tmp_path), num_workers=0)
+    assert runs[2].config is None and runs[2].error is not None
+    assert find_runs(str(tmp_path / "missing")) == []
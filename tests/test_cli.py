@@ -0,0 +1,182 @@
+import sys
+from typing import ClassVar, List
+
+import pytest
+
+from pydrantic.cli import main
+from pydrantic.config import RunConfig
+
+
+class RecordingConfig(RunConfig):
+    x: int = 0
+
+    events: ClassVar[List[str]] = []
+
+    def run(self):
+        self.events.append(f"run-{self.x}")
+        return self.x
+
+
+@pytest.fixture
+def argv(monkeypatch):
+    def _set(*args):
+        monkeypatch.setattr(sys, "argv", ["script.py", *args])
+    RecordingConfig.events = []
+    return _set
+
+
+def test_main_list_updated_in_place(argv, tmp_path):
+    argv("x=5")
+    configs = [RecordingConfig(output_dir=str(tmp_path)), RecordingConfig(output_dir=str(tmp_path))]
+    main(configs)
+    assert all(config.x == 5 for config in configs)
+    assert all((tmp_path / config.launch_id / config.run_id / "config.yaml").exists() for config in configs)
+
+
+@pytest.mark.parametrize("extra_args", [[], ["--prepare-workers", "2"]])
+def test_main_does_not_write_to_run_dir_without_output_dir(argv, tmp_path, extra_args):
+    argv(*extra_args)
+    run_dir = tmp_path / "run"
+    main([RecordingConfig(run_dir=str(run_dir))])
+    assert not run_dir.exists()
+
+
+def test_main_streams_generators(argv):
+    argv("x=7")
+
+    def generate():
+        for idx in range(3):
+            RecordingConfig.events.append(f"generate-{idx}")
+            yield RecordingConfig(run_id=str(idx))
+
+    main(generate())
+    # each config is run before the next one is generated
+    assert RecordingConfig.events == [
+        "generate-0", "run-7", "generate-1", "run-7", "generate-2", "run-7"
+    ]
+
+
+def test_main_parallel_preparation(argv, tmp_path, capsys):
+    argv("--prepare-workers", "4", "x=3")
+    configs = [RecordingConfig(output_dir=str(tmp_path), run_id="run") for _ in range(20)]
+    main(configs)
+    assert [config.run_id for config in configs] == [f"run-{idx}" for idx in range(20)]
+    for config in configs:
+        loaded = RecordingConfig.from_yaml(str(tmp_path / config.launch_id / config.run_id / "config.yaml"))
+        assert loaded.x == 3
+    assert RecordingConfig.events == ["run-3"] * 20
+    assert "Preparation time" in capsys.readouterr().out
+
+
+class MaybeFailingConfig(RunConfig):
+    x: int = 0
+
+    def run(self):
+        if self.x < 0:
+            raise ValueError("negative")
+        return self.x * 2
+
+
+@pytest.mark.parametrize("extra_args", [[], ["--max-tasks-per-child", "1"]])
+def test_main_process_executor(argv, capsys, extra_args):
+    argv("-p", "--executor", "process", "--num-workers", "2", *extra_args)
+    main([MaybeFailingConfig(x=1), MaybeFailingConfig(x=-1), MaybeFailingConfig(x=2)])
+    out = capsys.readouterr().out
+    assert "Completed: 3 (100.0% -- 1 failed) | Total: 3" in out
+    assert "negative" in out
+
+
+def test_main_returns_results_and_continues_after_errors(argv):
+    argv()
+    results = main([MaybeFailingConfig(x=1), MaybeFailingConfig(x=-1), MaybeFailingConfig(x=2)])
+    assert [result.output for result in results] == [2, None, 4]
+    assert [result.ok for result in results] == [True, False, True]
+    assert isinstance(results[1].error, ValueError)
+    assert all(result.wall_time is not None for result in results)
+
+
+def test_launch_yields_results_as_they_complete():
+    from pydrantic.cli import launch
+    from pydrantic.executors import ThreadExecutor
+
+    handle = launch(
+        (MaybeFailingConfig(x=x) for x in range(5)), 
+        updates=["x=3"],
+        executor=ThreadExecutor(num_workers=2), 
+        max_in_flight=2,
+    )
+    first = next(handle)
+    assert first.output == 6
+    results = handle.results()
+    assert len(results) == 5 and results[0] is first
+    output, config, error = results[-1]
+    assert output == 6 and config.x == 3 and error is None
+
+
+class FlakyConfig(RunConfig):
+    x: int = 0
+
+    preempted: ClassVar[bool] = False
+
+    def run(self):
+        if self.preempted and self.x == 1:
+            raise RuntimeError("preempted")
+        return self.x
+
+
+def test_main_resume_skips_completed_configs(argv, tmp_path):
+    import json
+    argv()
+    FlakyConfig.preempted = True
+    first = main([FlakyConfig(x=x, output_dir=str(tmp_path)) for x in range(3)])
+    assert [result.ok for result in first] == [True, False, True]
+    launch_id = first[0].config.launch_id
+    statuses = [
+        json.load(open(tmp_path / launch_id / result.config.run_id / "status.json"))["status"] 
+        for result in first
+    ]
+    assert statuses == ["completed", "failed", "completed"]
+
+    # the failed config is rerun, the others are skipped
+    FlakyConfig.preempted = False
+    argv("--resume", "latest")
+    second = main([FlakyConfig(x=x, output_dir=str(tmp_path)) for x in range(3)])
+    assert [result.output for result in second] == [1]
+    assert second[0].config.launch_id == launch_id
+
+    argv("--resume", launch_id)
+    assert main([FlakyConfig(x=x, output_dir=str(tmp_path)) for x in range(3)]) == []
+
+
+def test_launch_resume_with_run_dir_and_no_output_dir(tmp_path):
+    from pydrantic.cli import launch
+    configs = [RecordingConfig(x=x, run_dir=str(tmp_path / f"r{x}")) for x in range(2)]
+    results = launch(configs, resume="latest").results()
+    assert sorted(result.output for result in results) == [0, 1]
+
+
+def test_fingerprint_ignores_run_identity():
+    a = FlakyConfig(x=1, run_id="a", launch_id="launch-a", output_dir="/tmp/a")
+    b = FlakyConfig(x=1, run_id="b", launch_id="launch-b", output_dir="/tmp/b")
+    assert a.fingerprint() == b.fingerprint()
+    assert a.fingerprint() != FlakyConfig(x=2).fingerprint()
+
+
+def test_main_dedupe(argv, capsys):
+    # overriding x collapses the sweep to a single unique config
+    argv("--dedupe", "x=4")
+    results = main([RecordingConfig(x=x) for x in range(3)])
+    assert RecordingConfig.events == ["run-4"]
+    assert [result.output for result in results] == [4, 4, 4]
+    assert [result.duplicate_of for result in results] == [None, results[0].config.run_id, results[0].config.run_id]
+    assert "Saved 2 runs" in capsys.readouterr().out
+
+
+def test_launch_dedupe_waits_for_running_duplicates():
+    from pydrantic.cli import launch
+    from pydrantic.executors import ThreadExecutor
+    configs = [MaybeFailingConfig(x=x % 2) for x in range(6)]
+    handle = launch(configs, executor=ThreadExecutor(num_workers=4), dedupe=True)
+    results = handle.results()
+    assert len(results) == 6 and handle.num_deduplicated == 4
+    assert sorted(result.output for result in results) == [0, 0, 0, 2, 2, 2]
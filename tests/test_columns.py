@@ -0,0 +1,98 @@
+from typing import Optional
+
+import pytest
+
+from pydrantic import BaseConfig
+from pydrantic.columns import to_columns
+from pydrantic.utils import flatten_dict
+
+
+class ModelConfig(BaseConfig):
+    num_layers: int = 2
+    bias: bool = True
+
+
+class WideModelConfig(ModelConfig):
+    width: int = 128
+
+
+class TrainConfig(BaseConfig):
+    lr: float = 1e-3
+    name: str = "run"
+    seed: Optional[int] = None
+    betas: tuple = (0.9, 0.999)
+    model: ModelConfig = ModelConfig()
+
+
+def _configs():
+    return [
+        TrainConfig(lr=1, seed=0),
+        TrainConfig(lr=0.1, model=WideModelConfig(width=64)),
+        TrainConfig(name="other", model=ModelConfig(bias=False)),
+    ]
+
+
+def test_to_columns():
+    configs = _configs()
+    columns = to_columns(configs, exclude=["model._config_type._module"])
+    assert columns.num_rows == 3
+    assert "model._config_type._module" not in columns.values
+    assert columns.values["lr"] == [1, 0.1, 1e-3]
+    assert columns.values["model.width"] == [None, 64, None]
+    assert columns.missing["model.width"] == [True, False, True]
+    # None values are not missing
+    assert columns.values["seed"] == [0, None, None]
+    assert columns.missing["seed"] == [False, False, False]
+    assert columns.kinds["lr"] == "float"
+    assert columns.kinds["seed"] == "int"
+    assert columns.kinds["model.bias"] == "bool"
+    assert columns.kinds["name"] == "str"
+    assert columns.kinds["betas"] == "object"
+
+    # the keys are the same as those of `flatten`
+    for idx, config in enumerate(configs):
+        row = {k: v[idx] for k, v in columns.values.items() if not columns.missing[k][idx]}
+        expected = flatten_dict(config.to_dict(), sep=".")
+        del expected["model._config_type._module"]
+        assert row == expected
+
+
+def test_columns_to_numpy():
+    np = pytest.importorskip("numpy")
+    arrays = to_columns(_configs()).to_numpy()
+    width, mask = arrays["model.width"]
+    assert width.dtype == np.int64 and width.tolist() == [0, 64, 0]
+    assert mask.tolist() == [True, False, True]
+    assert arrays["lr"][0].dtype == np.float64
+    assert arrays["betas"][0].dtype == object and arrays["betas"][0][0] == (0.9, 0.999)
+
+    # Nones in `Optional[int]` fields are kept rather than filled with 0
+    seed, mask = arrays["seed"]
+    assert seed.dtype == object and seed.tolist() == [0, None, None]
+    assert mask.tolist() == [False, False, False]
+
+
+def test_columns_to_numpy_optional_bool():
+    np = pytest.importorskip("numpy")
+
+    class FlagConfig(BaseConfig):
+        flag: Optional[bool] = None
+
+    arrays = to_columns([FlagConfig(flag=True), FlagConfig()]).to_numpy()
+    flag, mask = arrays["flag"]
+    assert flag.dtype == object and flag.tolist() == [True, None]
+    assert mask.tolist() == [False, False]
+
+
+def test_columns_to_pandas_and_arrow():
+    pd = pytest.importorskip("pandas")
+    df = to_columns(_configs()).to_pandas()
+    assert str(df["model.width"].dtype) == "Int64"
+    assert df["model.width"].isna().tolist() == [True, False, True]
+    assert df["lr"].tolist() == [1.0, 0.1, 1e-3]
+
+    pytest.importorskip("pyarrow")
+    table = to_columns(_configs()).to_arrow()
+    assert table.num_rows == 3
+    assert table.column("model.width").to_pylist() == [None, 64, None]
+    assert table.column("betas").to_pylist() == ["(0.9, 0.999)"] * 3
@@ -0,0 +1,167 @@
+import sys
+
+import pytest
+
+from pydrantic.config import RunConfig
+from pydrantic.executors import (
+    Executor,
+    EXECUTORS,
+    SerialExecutor,
+    ThreadExecutor,
+    ProcessExecutor,
+    available_executors,
+    get_executor,
+    register_executor,
+)
+
+
+class SquareConfig(RunConfig):
+    x: int = 0
+
+    def run(self):
+        if self.x < 0:
+            raise ValueError("negative")
+        return self.x ** 2
+
+
+def _run_all(executor: Executor, configs):
+    handles = [executor.submit(config) for config in configs]
+    results = []
+    while handles:
+        complete, handles = executor.wait(handles)
+        results.extend(complete)
+    executor.shutdown()
+    return results
+
+
+@pytest.mark.parametrize(
+    "executor_fn", 
+    [SerialExecutor, lambda: ThreadExecutor(num_workers=2), lambda: ProcessExecutor(num_workers=2)]
+)
+def test_executors_return_results_and_errors(executor_fn):
+    results = _run_all(executor_fn(), [SquareConfig(x=x) for x in [1, 2, -1, 3]])
+    outputs = sorted(output for output, _, error in results if error is None)
+    errors = [error for _, _, error in results if error is not None]
+    assert outputs == [1, 4, 9]
+    assert len(errors) == 1 and isinstance(errors[0], ValueError)
+
+
+def test_builtin_executors_are_registered():
+    assert {"serial", "thread", "process", "ray"} <= set(available_executors())
+    assert get_executor("process") is ProcessExecutor
+
+
+@pytest.mark.parametrize("name", ["serial", "thread", "process", "local"])
+def test_from_args_uses_defaults_for_missing_args(name):
+    from argparse import Namespace
+    executor = get_executor(name).from_args(Namespace())
+    executor.shutdown()
+
+
+def test_register_executor():
+    @register_executor("test-serial")
+    class TestExecutor(SerialExecutor):
+        pass
+
+    try:
+        assert get_executor("test-serial") is TestExecutor
+    finally:
+        EXECUTORS.pop("test-serial")
+
+
+def test_entry_points_before_python_310(monkeypatch):
+    import importlib.metadata
+    from pydrantic import executors
+
+    entry_point = importlib.metadata.EntryPoint(
+        name="test-entry-point", value="pydrantic.executors:SerialExecutor", group="pydrantic.executors"
+    )
+
+    def entry_points(**kwargs):
+        # Python 3.9 takes no arguments and returns a dict of groups
+        assert len(kwargs) == 0
+        return {"pydrantic.executors": [entry_point]}
+
+    monkeypatch.setattr(executors.sys, "version_info", (3, 9))
+    monkeypatch.setattr(importlib.metadata, "entry_points", entry_points)
+    try:
+        assert "test-entry-point" in available_executors()
+        assert get_executor("test-entry-point") is SerialExecutor
+    finally:
+        EXECUTORS.pop("test-entry-point", None)
+
+
+def test_unknown_executor():
+    with pytest.raises(ValueError, match="Unknown executor"):
+        get_executor("does-not-exist")
+
+
+class EnvConfig(RunConfig):
+    seconds: float = 0.2
+
+    def run(self):
+        import os
+        import time
+        start = time.time()
+        time.sleep(self.seconds)
+        return os.environ["CUDA_VISIBLE_DEVICES"], os.environ["OMP_NUM_THREADS"], start, time.time()
+
+
+def test_resource_pool():
+    from pydrantic.executors import ResourcePool
+    pool = ResourcePool(devices=["0", "1", "2"], cpus=[0, 1, 2, 3], memory=10)
+    assert pool.capacity(gpus=1, cpus=1, memory=4) == 2
+
+    first = pool.acquire(gpus=2, cpus=2, memory=4)
+    assert first.devices == ["0", "1"] and first.cpus == [0, 1]
+    assert pool.acquire(gpus=2, cpus=1, memory=1) is None  # not enough devices
+    second = pool.acquire(gpus=1, cpus=2, memory=4)
+    assert second.devices == ["2"]
+    assert pool.acquire(gpus=0, cpus=1, memory=0) is None  # not enough cpus
+
+    pool.release(first)
+    third = pool.acquire(gpus=0, cpus=1, memory=6)
+    assert third is not None
+    assert pool.acquire(gpus=0, cpus=1, memory=1) is None  # not enough memory
+
+
+def test_local_executor_pins_simulated_devices():
+    from pydrantic.executors import LocalExecutor
+    executor = LocalExecutor(
+        devices=["0", "1", "2", "3"], gpus_per_config=2, cpus_per_config=1, num_cpus=4
+    )
+    results = _run_all(executor, [EnvConfig() for _ in range(4)])
+    assert all(error is None for _, _, error in results)
+
+    runs = [output for output, _, _ in results]
+    assert {devices for devices, *_ in runs} == {"0,1", "2,3"}
+    assert all(num_threads == "1" for _, num_threads, *_ in runs)
+    # runs that share devices never overlap in time
+    for devices in ["0,1", "2,3"]:
+        intervals = sorted((start, end) for d, _, start, end in runs if d == devices)
+        assert all(prev[1] <= nxt[0] for prev, nxt in zip(intervals, intervals[1:]))
+
+
+class PidConfig(RunConfig):
+    def run(self):
+        import os
+        return os.getpid()
+
+
+@pytest.mark.parametrize("version_info", [(3, 10), (3, 11)])
+def test_local_executor_runs_each_config_in_a_fresh_process(monkeypatch, version_info):
+    from pydrantic import executors
+
+    if version_info >= (3, 11) and sys.version_info < (3, 11):
+        pytest.skip("`max_tasks_per_child` requires Python 3.11")
+    monkeypatch.setattr(executors.sys, "version_info", version_info)
+    executor = executors.LocalExecutor(devices=["0", "1"], gpus_per_config=1)
+    results = _run_all(executor, [PidConfig() for _ in range(4)])
+    pids = [output for output, _, _ in results]
+    assert len(set(pids)) == 4
+
+
+def test_local_executor_rejects_configs_that_do_not_fit():
+    from pydrantic.executors import LocalExecutor
+    with pytest.raises(ValueError):
+        LocalExecutor(devices=["0"], gpus_per_config=2)
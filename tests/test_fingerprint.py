@@ -0,0 +1,68 @@
+from typing import Dict, List, Optional, Type
+
+from pydantic import Field
+
+from pydrantic.config import BaseConfig, RunConfig
+
+
+class LayerConfig(BaseConfig):
+    dim: int = 16
+    activation: str = "relu"
+
+
+class ModelConfig(BaseConfig):
+    layers: List[LayerConfig] = Field(default_factory=lambda: [LayerConfig()])
+    head: Optional[LayerConfig] = None
+    metadata: Dict[str, float] = Field(default_factory=dict)
+    cls: Type = LayerConfig
+
+
+class TrainConfig(RunConfig):
+    lr: float = 1e-3
+    model: ModelConfig = Field(default_factory=ModelConfig)
+
+    def run(self):
+        pass
+
+
+def test_fingerprint_is_deterministic():
+    a = TrainConfig(model=ModelConfig(metadata={"b": 1.0, "a": 2.0}))
+    b = TrainConfig(model=ModelConfig(metadata={"a": 2.0, "b": 1.0}))
+    assert a.fingerprint() == b.fingerprint()
+    assert a.equivalent(b)
+
+
+def test_fingerprint_depends_on_values_and_types():
+    base = TrainConfig().fingerprint()
+    assert TrainConfig(lr=1e-2).fingerprint() != base
+    assert TrainConfig(model=ModelConfig(cls=ModelConfig)).fingerprint() != base
+    assert TrainConfig(model=ModelConfig(layers=[LayerConfig(dim=32)])).fingerprint() != base
+
+
+def test_fingerprint_is_invalidated_on_assignment():
+    config = TrainConfig()
+    before = config.fingerprint()
+    config.lr = 0.5
+    assert config.fingerprint() != before
+
+    # assigning a field of a nested config also changes the parent's fingerprint
+    before = config.fingerprint()
+    config.model.layers[0].dim = 64
+    assert config.fingerprint() != before
+    config.model.layers[0].dim = 16
+    assert config.fingerprint() == before
+
+
+def test_fingerprint_excludes_run_identity():
+    a = TrainConfig(run_id="a", output_dir="out", launch_id="x", script_id="s", run_dir="out/x/a")
+    assert a.fingerprint() == TrainConfig().fingerprint()
+
+
+def test_fingerprint_memo_is_not_compared_or_copied():
+    config = TrainConfig()
+    config.fingerprint()
+    # the memo doesn't affect equality
+    assert config == TrainConfig()
+
+    updated = config.model_copy(update={"lr": 0.5})
+    assert updated.fingerprint() == TrainConfig(lr=0.5).fingerprint()
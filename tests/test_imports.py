@@ -0,0 +1,66 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+import pydrantic
+
+
+# modules that `import pydrantic` must not import
+HEAVY_MODULES = ["pydantic", "yaml", "dill", "ray", "rich", "wandb", "numpy", "pandas", "pyarrow"]
+
+
+def _run(code: str) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(out.splitlines()[-1])
+
+
+def _loaded_after(statement: str) -> list:
+    return _run(
+        "import json, sys\n"
+        f"{statement}\n"
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    )
+
+
+def test_import_is_lazy():
+    assert _loaded_after("import pydrantic") == []
+
+
+def test_import_config_skips_serializers():
+    # workers import the config module to unpickle configs
+    assert _loaded_after("import pydrantic.config") == ["pydantic"]
+
+
+def test_import_time(record_property):
+    # the best of a few runs, to track startup time
+    times = [
+        _run(
+            "import json, time\n"
+            "start = time.perf_counter()\n"
+            "import pydrantic\n"
+            "print(json.dumps(time.perf_counter() - start))"
+        )
+        for _ in range(3)
+    ]
+    record_property("import_time", min(times))
+
+
+def test_lazy_attributes():
+    for name in pydrantic.__all__:
+        assert getattr(pydrantic, name) is not None
+    assert set(pydrantic.__all__) <= set(dir(pydrantic))
+    from pydrantic import BaseConfig
+    from pydrantic.config import BaseConfig as _BaseConfig
+    assert BaseConfig is _BaseConfig
+
+    with pytest.raises(AttributeError, match="no attribute 'missing'"):
+        pydrantic.missing
+
+
+def test_yaml_dumper_attribute():
+    from pydrantic.utils import YamlDumper, _yaml_dumpers
+    assert YamlDumper is _yaml_dumpers()[0]
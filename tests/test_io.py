@@ -123,4 +123,180 @@ def test_type_serialization(tmp_dir):
     config.to_yaml(str(yaml_path))
     
     loaded_config = SimpleConfig.from_yaml(str(yaml_path))
-    assert loaded_config.t == NestedConfig
\ No newline at end of file
+    assert loaded_config.t == NestedConfig
+
+
+class PairConfig(BaseConfig):
+    first: SimpleConfig
+    second: SimpleConfig
+
+def test_to_dict_is_invalidated_on_assignment():
+    config = NestedConfig(simple=SimpleConfig(x=2))
+    assert config.to_dict()["simple"]["x"] == 2
+
+    config.simple.x = 3
+    assert config.to_dict()["simple"]["x"] == 3
+    config.y = "world"
+    assert config.to_dict()["y"] == "world"
+
+    copied = config.model_copy(update={"x": 4})
+    assert copied.to_dict()["x"] == 4
+    assert config.to_dict()["x"] == 1
+
+def test_to_dict_sees_in_place_mutations(tmp_dir):
+    from pydrantic.config import ObjectConfig
+
+    config = ObjectConfig(target=dict, kwargs={})
+    assert config.to_dict()["kwargs"] == {}
+    config.kwargs["a"] = 1
+    assert config.to_dict()["kwargs"] == {"a": 1}
+    assert config.flatten()["kwargs/a"] == 1
+
+    yaml_path = tmp_dir / "object.yaml"
+    config.to_yaml(str(yaml_path))
+    assert ObjectConfig.from_yaml(str(yaml_path)).kwargs == {"a": 1}
+
+    # the dicts of subconfigs without containers are still shared
+    nested = NestedConfig(simple=SimpleConfig(x=2))
+    assert nested._cached_dict() is nested._cached_dict()
+
+def test_to_dict_returns_a_fresh_copy(tmp_dir):
+    simple = SimpleConfig(x=2)
+    config = PairConfig(first=simple, second=simple)
+    data = config.to_dict()
+    data["first"]["x"] = 5
+    assert data["second"]["x"] == 2
+    assert config.to_dict()["first"]["x"] == 2
+
+    # shared subconfigs are written out in full rather than as yaml aliases
+    yaml_path = tmp_dir / "pair.yaml"
+    config.to_yaml(str(yaml_path))
+    assert "&id" not in yaml_path.read_text()
+    assert PairConfig.from_yaml(str(yaml_path)) == config
+
+
+def test_memoized_dict_is_not_pickled():
+    import pickle
+
+    config = NestedConfig(simple=SimpleConfig(x=2))
+    config.to_dict()
+    loaded = pickle.loads(pickle.dumps(config))
+    assert getattr(loaded, "_dict", None) is None
+    assert loaded == config
+    assert loaded.to_dict() == config.to_dict()
+
+def _yaml_test_data():
+    import collections
+    shared = [1, 2]
+    return {
+        "float": 1.5e-5, "inf": float("inf"), "big": 10**30, "none": None, "empty": "",
+        "unicode": "héllo ☃", "long": "x" * 200 + " y" * 100, "quoted": "'a' \"b\"",
+        "multiline": "line1\nline2\n", "indented": "  lead\ntrail  \n", "tab": "\t tab",
+        "tuple": (1, ""), "nested": {"a": [{"b": True}, "c\nd"]}, "s1": shared, "s2": shared,
+        "ordered": collections.OrderedDict(a="x\ny"), "type": int, "func": os.path.join,
+    }
+
+@pytest.mark.parametrize("transform", [True, False])
+def test_save_yaml_matches_python_emitter(tmp_dir, transform):
+    from pydrantic.utils import save_yaml, transform_into_literals
+
+    data = _yaml_test_data()
+    path = tmp_dir / "data.yaml"
+    save_yaml(data, path, transform=transform)
+    expected = yaml.dump(
+        transform_into_literals(data) if transform else data, Dumper=yaml.Dumper, sort_keys=True
+    )
+    assert path.read_text() == expected
+    assert yaml.load(path.read_text(), Loader=yaml.Loader)["multiline"] == "line1\nline2\n"
+
+def test_to_yaml_matches_python_emitter(tmp_dir):
+    config = PairConfig(
+        first=SimpleConfig(y="multi\nline", t=NestedConfig), second=SimpleConfig(y="")
+    )
+    yaml_path = tmp_dir / "config.yaml"
+    config.to_yaml(str(yaml_path))
+    assert yaml_path.read_text() == yaml.dump(config.to_dict(), Dumper=yaml.Dumper)
+    assert PairConfig.from_yaml(str(yaml_path)) == config
+
+class ValuesConfig(BaseConfig):
+    betas: tuple = (0.9, 0.999)
+    limit: float = float("inf")
+    by_layer: dict = {1: "a", 2: ("b", "c")}
+    big: int = 10**30
+    t: Type = BaseConfig
+    simple: SimpleConfig = SimpleConfig()
+    items: list = []
+
+@pytest.mark.parametrize("fmt", ["json", "msgpack"])
+def test_to_from_json_and_msgpack(tmp_dir, fmt):
+    if fmt == "msgpack":
+        pytest.importorskip("msgpack")
+    config = ValuesConfig(items=[SimpleConfig(x=3), "multi\nline"], simple=SimpleConfig(t=NestedConfig))
+
+    path = tmp_dir / f"config.{fmt}"
+    getattr(config, f"to_{fmt}")(str(path))
+    assert getattr(ValuesConfig, f"from_{fmt}")(str(path)) == config
+
+    # the format is detected from the content if the extension is unknown
+    from pydrantic.utils import load_binary
+    os.rename(path, tmp_dir / "config.bin")
+    assert ValuesConfig.from_dict(load_binary(tmp_dir / "config.bin")) == config
+
+def test_load_binary_does_not_detect_pickles(tmp_dir):
+    from pydrantic.utils import load_binary
+
+    config = SimpleConfig(x=2)
+    config.to_pickle(str(tmp_dir / "config.pkl"))
+    assert SimpleConfig.from_dict(load_binary(tmp_dir / "config.pkl")) == config
+
+    os.rename(tmp_dir / "config.pkl", tmp_dir / "config.bin")
+    with pytest.raises(ValueError, match="looks like a pickle"):
+        load_binary(tmp_dir / "config.bin")
+
+def test_json_without_orjson(tmp_dir, monkeypatch):
+    import sys
+    monkeypatch.setitem(sys.modules, "orjson", None)
+
+    config = ValuesConfig(limit=float("-inf"))
+    path = tmp_dir / "config.json"
+    config.to_json(str(path))
+    assert ValuesConfig.from_json(str(path)) == config
+
+
+def test_type_from_dict_caches_imports():
+    import traceback
+    from pydrantic.utils import _cached_import, clear_import_cache, import_cache_info, import_object, type_from_dict, type_to_dict
+
+    clear_import_cache()
+    d = type_to_dict(OuterClass.InnerConfig)
+    assert type_from_dict(d) is OuterClass.InnerConfig
+    assert type_from_dict(d) is OuterClass.InnerConfig
+    assert import_object("os.path.join") is os.path.join
+    info = import_cache_info()
+    assert (info.hits, info.misses) == (1, 2)
+
+    # missing objects are remembered too
+    for _ in range(2):
+        with pytest.raises(ModuleNotFoundError):
+            type_from_dict({"_is_type": True, "_module": "missing_module", "_qualname": "Config"})
+        with pytest.raises(AttributeError):
+            import_object("os.path.missing")
+    info = import_cache_info()
+    assert (info.hits, info.misses) == (3, 4)
+
+    # each miss raises a new error, so callers don't share (or keep alive) tracebacks
+    errors = []
+    for _ in range(3):
+        with pytest.raises(ModuleNotFoundError) as e:
+            import_object("nope_mod.Config")
+        errors.append(e.value)
+    assert len({id(error) for error in errors}) == 3
+    # the attributes of the errors are kept
+    assert all(error.name == "nope_mod" for error in errors)
+    # the first miss raises the original error
+    assert "_import" in {frame.name for frame in traceback.extract_tb(errors[0].__traceback__)}
+    cached = _cached_import("nope_mod", "Config")[1]
+    assert cached.__traceback__ is None
+
+    clear_import_cache()
+    assert import_cache_info().currsize == 0
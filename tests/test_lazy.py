@@ -0,0 +1,117 @@
+from typing import Dict, List, Type
+
+import pytest
+from pydantic import ConfigDict, Field, ValidationError
+
+from pydrantic import BaseConfig
+from pydrantic.lazy import LazyConfig
+
+
+class LayerConfig(BaseConfig):
+    dim: int = Field(16, gt=0)
+    activation: str = "relu"
+
+
+class ModelConfig(BaseConfig):
+    head: LayerConfig = LayerConfig()
+    layers: List[LayerConfig] = []
+    by_name: Dict[str, LayerConfig] = {}
+    cls: Type = LayerConfig
+
+
+class TrainConfig(BaseConfig):
+    lr: float = 1e-3
+    betas: tuple = (0.9, 0.999)
+    model: ModelConfig = ModelConfig()
+
+
+def _config():
+    return TrainConfig(
+        lr=0.1,
+        model=ModelConfig(
+            head=LayerConfig(dim=8), 
+            layers=[LayerConfig(dim=2)], 
+            by_name={"a": LayerConfig(activation="gelu")},
+        ),
+    )
+
+
+def test_lazy_from_dict(tmp_path):
+    config = _config()
+    lazy = BaseConfig.from_dict(config.to_dict(), lazy=True)
+    assert isinstance(lazy, LazyConfig)
+    assert lazy.lr == 0.1
+    assert isinstance(lazy.model, LazyConfig)
+    assert lazy.model.head.dim == 8
+    assert lazy.model.layers == [LayerConfig(dim=2)]
+    assert lazy.model.by_name == {"a": LayerConfig(activation="gelu")}
+    assert lazy.model.cls is LayerConfig
+    assert lazy.betas == (0.9, 0.999)
+    assert lazy.config_cls is TrainConfig
+    assert lazy.validate_all() == config
+    with pytest.raises(AttributeError):
+        lazy.missing
+
+    path = tmp_path / "config.yaml"
+    config.to_yaml(str(path))
+    assert TrainConfig.from_yaml(str(path), lazy=True).model.head.dim == 8
+
+
+def test_lazy_defaults_and_errors():
+    data = TrainConfig().to_dict()
+    del data["lr"]
+    data["model"]["head"]["dim"] = -1
+    data["betas"] = "not a tuple"
+    lazy = BaseConfig.from_dict(data, lazy=True)
+
+    # only the fields that are accessed are validated
+    assert lazy.lr == 1e-3
+    assert lazy.model.head.activation == "relu"
+    with pytest.raises(ValidationError) as e:
+        lazy.model.head.dim
+    assert e.value.title == "LayerConfig"
+    assert e.value.errors()[0]["loc"] == ("dim",)
+    with pytest.raises(ValidationError, match="betas"):
+        lazy.betas
+
+    with pytest.raises(ValidationError) as e:
+        lazy.validate_all()
+    # all the errors are reported at once
+    assert {error["loc"] for error in e.value.errors()} == {("betas",), ("model", "head", "dim")}
+
+
+def test_lazy_unknown_fields():
+    data = TrainConfig().to_dict()
+    data["removed"] = 1
+    with pytest.raises(ValueError, match="Missing fields: removed"):
+        BaseConfig.from_dict(data, lazy=True).lr
+    assert BaseConfig.from_dict(data, strict=False, lazy=True).lr == 1e-3
+
+
+def test_field_adapters_are_shared_by_annotation():
+    from pydrantic.lazy import _field_adapter
+
+    class OtherLayerConfig(BaseConfig):
+        dim: int = Field(16, gt=0)
+
+    assert _field_adapter(LayerConfig, "dim") is _field_adapter(OtherLayerConfig, "dim")
+    assert _field_adapter(LayerConfig, "dim") is not _field_adapter(TrainConfig, "lr")
+
+
+class Obj:
+    pass
+
+
+class ArbitraryConfig(BaseConfig):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    obj: Obj = Field(default_factory=Obj)
+    layer: LayerConfig = LayerConfig()
+
+
+def test_lazy_fields_use_the_model_config():
+    data = {"obj": Obj(), "layer": LayerConfig(dim=3).to_dict()}
+    lazy = ArbitraryConfig.from_dict(data, lazy=True)
+    assert lazy.obj is data["obj"]
+    assert lazy.layer.dim == 3
+    assert lazy.validate_all().obj is data["obj"]
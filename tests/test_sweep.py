@@ -0,0 +1,98 @@
+import pytest
+from pydantic import Field
+
+from pydrantic.config import BaseConfig, RunConfig
+from pydrantic.sweep import Choice, LogUniform, Sweep, Uniform, linspace, logspace
+from pydrantic.variables import FormatStringVariable
+
+
+class ModelConfig(BaseConfig):
+    num_layers: int = 2
+    hidden_dim: int = 128
+
+
+class TrainConfig(RunConfig):
+    lr: float = 1e-3
+    batch_size: int = 32
+    name: str = "run"
+    model: ModelConfig = Field(default_factory=ModelConfig)
+
+    def run(self):
+        pass
+
+
+def test_logspace_and_linspace():
+    assert logspace(-2, 0, 3) == pytest.approx([0.01, 0.1, 1.0])
+    assert linspace(0, 1, 5) == pytest.approx([0.0, 0.25, 0.5, 0.75, 1.0])
+
+
+def test_grid():
+    sweep = Sweep(TrainConfig()).grid(lr=[0.1, 0.01], batch_size=[16, 32, 64])
+    configs = sweep.to_list()
+    assert len(sweep) == len(configs) == 6
+    assert [(c.lr, c.batch_size) for c in configs] == [
+        (0.1, 16), (0.1, 32), (0.1, 64), (0.01, 16), (0.01, 32), (0.01, 64)
+    ]
+
+
+def test_zip_nested_paths():
+    sweep = Sweep(TrainConfig()).zip({"model.num_layers": [2, 4], "model.hidden_dim": [256, 512]})
+    configs = sweep.to_list()
+    assert [(c.model.num_layers, c.model.hidden_dim) for c in configs] == [(2, 256), (4, 512)]
+
+
+def test_zip_requires_equal_lengths():
+    with pytest.raises(ValueError):
+        Sweep(TrainConfig()).zip(lr=[0.1, 0.01], batch_size=[16])
+
+
+def test_random_is_seeded():
+    def build():
+        return Sweep(TrainConfig()).random(
+            10, rng_seed=0, lr=LogUniform(1e-5, 1e-1), batch_size=[16, 32], 
+        )
+    configs = build().to_list()
+    assert [c.lr for c in configs] == [c.lr for c in build().to_list()]
+    assert all(1e-5 <= c.lr <= 1e-1 for c in configs)
+    assert all(c.batch_size in (16, 32) for c in configs)
+
+
+def test_seed_and_axes_can_be_swept():
+    class SeedConfig(BaseConfig):
+        seed: int = 0
+        axes: int = 0
+        lr: float = 1e-3
+
+    configs = Sweep(SeedConfig()).random(3, seed=[1, 2, 3], rng_seed=0).to_list()
+    assert len(configs) == 3 and all(c.seed in (1, 2, 3) for c in configs)
+
+    configs = Sweep(SeedConfig()).grid(seed=[1, 2], axes=[3]).zip(lr=[0.1]).to_list()
+    assert [(c.seed, c.axes, c.lr) for c in configs] == [(1, 3, 0.1), (2, 3, 0.1)]
+
+
+def test_blocks_are_combined_as_product():
+    sweep = (
+        Sweep(TrainConfig())
+        .grid(lr=[0.1, 0.01])
+        .zip({"model.num_layers": [2, 4, 8]})
+        .random(2, rng_seed=0, batch_size=Choice([8, 16]))
+    )
+    assert len(sweep) == 12
+    assert len({(c.lr, c.model.num_layers) for c in sweep}) == 6
+
+
+def test_untouched_subconfigs_are_shared():
+    base = TrainConfig()
+    configs = Sweep(base).grid(lr=[0.1, 0.01]).to_list()
+    assert all(c.model is base.model for c in configs)
+
+
+def test_variables_are_resolved_per_point():
+    base = TrainConfig(lr=1.0, name=FormatStringVariable("lr={lr}"))
+    configs = Sweep(base).grid(lr=[0.1, 0.01]).to_list()
+    assert [c.name for c in configs] == ["lr=0.1", "lr=0.01"]
+
+
+def test_uniform_bounds():
+    configs = Sweep(TrainConfig()).random(20, rng_seed=1, lr=Uniform(0.1, 0.2)).to_list()
+    assert all(0.1 <= c.lr <= 0.2 for c in configs)
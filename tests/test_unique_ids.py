@@ -0,0 +1,74 @@
+from typing import Dict, List, Type
+
+from pydantic import Field
+
+from pydrantic import BaseConfig
+from pydrantic.config import get_unique_ids
+from pydrantic.utils import flatten_dict
+
+
+class ModelConfig(BaseConfig):
+    num_layers: int = 2
+    hidden_dim: int = 64
+
+
+class TrainConfig(BaseConfig):
+    lr: float = 1e-3
+    seed: int = 0
+    tags: List[str] = []
+    extra: Dict[str, set] = {}
+    cls: Type = ModelConfig
+    model: ModelConfig = Field(default_factory=ModelConfig)
+
+
+class OtherModelConfig(ModelConfig):
+    dropout: float = 0.1
+
+
+def test_unique_ids_of_differing_fields():
+    configs = [
+        TrainConfig(lr=1e-3, model=ModelConfig(num_layers=2)),
+        TrainConfig(lr=1e-4, model=ModelConfig(num_layers=2)),
+        TrainConfig(lr=1e-4, model=ModelConfig(num_layers=4)),
+    ]
+    # keys are ordered by their first appearance
+    assert get_unique_ids(configs) == [
+        "lr=0.001-num_layers=2", "lr=0.0001-num_layers=2", "lr=0.0001-num_layers=4"
+    ]
+    assert get_unique_ids(configs, exclude=["model.num_layers"]) == [
+        "lr=0.001", "lr=0.0001", "lr=0.0001"
+    ]
+    assert get_unique_ids([TrainConfig()]) == [""]
+
+
+def test_unique_ids_of_lists_types_and_unhashable_values():
+    configs = [
+        TrainConfig(tags=["a", "b"], extra={"x": {1}}),
+        TrainConfig(tags=["a", "c"], extra={"x": {2}}, cls=OtherModelConfig),
+    ]
+    assert get_unique_ids(configs) == [
+        "1=b-x={1}-_qualname=ModelConfig", 
+        "1=c-x={2}-_qualname=OtherModelConfig",
+    ]
+
+
+def test_unique_ids_of_missing_keys():
+    configs = [
+        TrainConfig(model=ModelConfig()),
+        TrainConfig(model=OtherModelConfig(dropout=0.1)),
+        TrainConfig(model=OtherModelConfig(dropout=0.2)),
+    ]
+    assert get_unique_ids(configs) == [
+        "_qualname=ModelConfig",
+        "_qualname=OtherModelConfig-dropout=0.1",
+        "_qualname=OtherModelConfig-dropout=0.2",
+    ]
+
+
+def test_flatten_config_matches_to_dict():
+    from pydrantic.config import _flatten_config
+
+    config = TrainConfig(tags=["a"], extra={"x": {1}}, model=OtherModelConfig())
+    flattened = {}
+    _flatten_config(config, "", ".", flattened)
+    assert flattened == flatten_dict(config.to_dict(), sep=".")
@@ -148,4 +148,101 @@ def test_override_variable_with_nested_config_and_nested_keys():
     assert updated_config.nested.nested_param1 == 10.0
     assert updated_config.nested.nested_param2 == "Hello, 10.0!"
     assert updated_config.param3 == "Hello, Hello, 10.0!!"
-    assert updated_config.param2 == "Hello, Hello, Hello, 10.0!!!"
\ No newline at end of file
+    assert updated_config.param2 == "Hello, Hello, Hello, 10.0!!!"
+
+def test_update_configs():
+    from pydrantic.cli import _update_configs
+    configs = [SimpleConfig(param1=i, param3=FormatStringVariable("{param1}")) for i in range(5)]
+    updates = ["param2=swept", "nested.nested_param1=2.5"]
+    updated_configs = _update_configs(configs, updates)
+    for i, updated_config in enumerate(updated_configs):
+        assert updated_config.param1 == i
+        assert updated_config.param2 == "swept"
+        assert updated_config.param3 == str(i)
+        assert updated_config.nested.nested_param1 == 2.5
+        assert updated_config.nested.nested_param2 == "nested_default"
+
+
+def test_override_beats_variable():
+    # an explicit override replaces the variable of the field it overrides
+    config = SimpleConfig(param1=1, param2=FormatStringVariable("Hello, {param1}!"))
+    updated_config = _update_config(config, ["param2=explicit", "param1=2"])
+    assert updated_config.param1 == 2
+    assert updated_config.param2 == "explicit"
+
+    config = SimpleConfig(
+        nested=NestedConfig(nested_param1=0.5, nested_param2=FormatStringVariable("{nested_param1}"))
+    )
+    updated_config = _update_config(config, ["nested.nested_param2=explicit"])
+    assert updated_config.nested.nested_param2 == "explicit"
+
+
+def test_update_configs_revalidates_shared_subconfigs_once():
+    from pydrantic.cli import _update_configs
+    nested = NestedConfig()
+    configs = [SimpleConfig(param1=i, nested=nested) for i in range(3)]
+    updated_configs = _update_configs(configs, ["nested.nested_param2=shared"])
+    assert updated_configs[0].nested is updated_configs[1].nested
+    assert updated_configs[0].nested.nested_param2 == "shared"
+    assert updated_configs[0] is not updated_configs[1]
+
+
+def test_override_through_non_config_raises_attribute_error():
+    config = SimpleConfig()
+    with pytest.raises(AttributeError):
+        _update_config(config, ["param1.foo=1"])
+
+
+def test_override_plan_precoerces_values():
+    from pydrantic.overrides import OverridePlan
+    plan = OverridePlan.from_updates(["param1=10", "nested.nested_param1=3"], SimpleConfig)
+    assert plan.values == {"param1": 10}
+    assert plan.children["nested"][1].values == {"nested_param1": 3.0}
+
+    updated_configs = plan.apply_many([SimpleConfig(param2="a"), SimpleConfig(param2="b")])
+    assert [c.param1 for c in updated_configs] == [10, 10]
+    assert [c.param2 for c in updated_configs] == ["a", "b"]
+    assert all(c.nested.nested_param1 == 3.0 for c in updated_configs)
+
+
+def test_override_plan_unknown_field_raises_attribute_error():
+    from pydrantic.overrides import OverridePlan
+    with pytest.raises(AttributeError):
+        OverridePlan.from_updates(["invalid_param=1"], SimpleConfig)
+    plan = OverridePlan.from_updates(["nested.invalid_param=1"], SimpleConfig)
+    with pytest.raises(AttributeError):
+        plan.apply(SimpleConfig())
+
+
+def test_override_plan_applies_to_subclasses():
+    from pydrantic.overrides import OverridePlan
+
+    class SubNestedConfig(NestedConfig):
+        extra: int = 0
+
+    plan = OverridePlan.from_updates(["nested.extra=5"], SimpleConfig)
+    updated_config = plan.apply(SimpleConfig(nested=SubNestedConfig()))
+    assert updated_config.nested.extra == 5
+
+
+def test_override_plan_is_thread_safe():
+    from concurrent.futures import ThreadPoolExecutor
+    from typing import Union
+    from pydrantic.overrides import OverridePlan
+
+    class OtherConfig(BaseConfig):
+        nested_param1: float = 0.0
+
+    class UnionConfig(RunConfig):
+        nested: Union[NestedConfig, OtherConfig] = Field(default_factory=NestedConfig)
+
+        def run(self):
+            pass
+
+    # the plan for `nested` is compiled lazily, from the first value we see
+    plan = OverridePlan.from_updates(["nested.nested_param1=0.5"], UnionConfig)
+    configs = [UnionConfig(nested=NestedConfig() if i % 2 else OtherConfig()) for i in range(64)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        updated = list(pool.map(plan.apply, configs))
+    assert all(config.nested.nested_param1 == 0.5 for config in updated)
+    assert [type(c.nested) for c in updated] == [type(c.nested) for c in configs]
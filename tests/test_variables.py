@@ -203,8 +203,140 @@ def test_cyclic_dependency():
         foo: str = "foo"
         bar: str = "bar"
         
-    with pytest.raises(ValidationError, match="Max resolution"):
+    with pytest.raises(ValidationError, match="Cyclic dependency"):
         config = Config(
             foo=FormatStringVariable("{bar}"),
             bar=FormatStringVariable("{foo}")
-        )
\ No newline at end of file
+        )
+
+
+def test_format_string_variable_resolves_through_configs():
+    from pydrantic.config import BaseConfig
+    class Inner(BaseConfig):
+        dim: int = 4
+        sizes: list = [1, 2]
+
+    variable = FormatStringVariable("{model.dim}-{model.sizes.1}-{model._config_type._is_type}")
+    data = {"model": Inner(dim=8), "nested": {"a.b": {"c": 3}}}
+    assert variable.resolve(data) == "8-2-True"
+    assert FormatStringVariable("{nested.a.b.c}").resolve(data) == "3"
+
+    # only leaf values can be referenced, as in the flattened data
+    with pytest.raises(KeyError):
+        FormatStringVariable("{model}").resolve(data)
+    with pytest.raises(KeyError):
+        FormatStringVariable("{model.sizes}").resolve(data)
+    with pytest.raises(KeyError):
+        FormatStringVariable("{model.sizes.2}").resolve(data)
+
+
+def test_format_string_variable_references_types():
+    from typing import Type
+    from pydrantic.config import BaseConfig
+
+    # a type is a leaf, unless the reference goes further into it
+    assert FormatStringVariable("{cls}").resolve({"cls": float}) == "<class 'float'>"
+    assert FormatStringVariable("{cls._qualname}").resolve({"cls": float}) == "float"
+
+    class Config(BaseConfig):
+        cls: Type = int
+        name: str = "default"
+
+    config = Config(cls=float, name=FormatStringVariable("{cls}"))
+    assert config.name == "<class 'float'>"
+
+
+def test_format_string_variable_unresolved_dependency():
+    variable = FormatStringVariable("{a}-{b}")
+    with pytest.raises(VariableResolutionError):
+        variable.resolve({"a": 1, "b": FormatStringVariable("{a}")})
+
+
+def test_variable_chains_resolve_in_dependency_order():
+    from pydrantic.config import BaseConfig
+    class Config(BaseConfig):
+        v0: str = "base"
+        v1: str = ""
+        v2: str = ""
+        v3: str = ""
+        v4: str = ""
+        v5: str = ""
+        v6: str = ""
+        v7: str = ""
+
+    # the chain is longer than the old limit of 5 retries and given in reverse order
+    variables = {f"v{i}": FormatStringVariable(f"{{v{i - 1}}}-{i}") for i in range(7, 0, -1)}
+    config = Config(v0="base", **variables)
+    assert config.v7 == "base-1-2-3-4-5-6-7"
+    assert list(config._variables) == [f"v{i}" for i in range(1, 8)]
+
+
+def test_cyclic_dependency_message():
+    from pydrantic.config import BaseConfig
+    class Config(BaseConfig):
+        foo: str = "foo"
+        bar: str = "bar"
+        baz: str = "baz"
+
+    with pytest.raises(ValidationError, match="foo -> baz -> bar -> foo"):
+        Config(
+            foo=FormatStringVariable("{baz}"),
+            bar=FormatStringVariable("{foo}"),
+            baz=FormatStringVariable("{bar}"),
+        )
+
+
+def test_custom_variables_are_retried():
+    from pydrantic.config import BaseConfig
+    from pydrantic.variables import BaseVariable
+
+    class Upper(BaseVariable):
+        def __init__(self, key):
+            self.key = key
+
+        def resolve(self, data):
+            if isinstance(data[self.key], BaseVariable):
+                raise VariableResolutionError(f"{self.key} is not resolved yet")
+            return data[self.key].upper()
+
+    class Config(BaseConfig):
+        name: str = "name"
+        upper: str = ""
+        label: str = ""
+
+    config = Config(
+        upper=Upper("label"),
+        label=FormatStringVariable("{name}-label"),
+        name="run",
+    )
+    assert config.upper == "RUN-LABEL"
+
+    with pytest.raises(ValidationError, match="Could not resolve variables: upper"):
+        Config(upper=Upper("label"), label=Upper("upper"))
+
+
+def test_identical_templates_share_compiled_form():
+    import pickle
+
+    a = FormatStringVariable("{x}-{y.z}")
+    b = FormatStringVariable("{x}-{y.z}")
+    assert a._compiled is b._compiled
+    assert pickle.loads(pickle.dumps(a))._compiled is a._compiled
+    assert b.resolve({"x": 1, "y": {"z": 2}}) == "1-2"
+
+
+def test_format_str():
+    from pydrantic import BaseConfig, FormatStr
+    class Config(BaseConfig):
+        lr: float = 0.1
+        name: str = "run"
+        run_id: FormatStr = "{name}-lr={lr:.2f}-{name!r}-{{literal}}"
+        real: FormatStr = "{lr.real}"
+
+    config = Config(lr=0.5)
+    assert config.run_id == "run-lr=0.50-'run'-{literal}"
+    # anything but plain field names falls back to str.format
+    assert config.real == "0.5"
+
+    with pytest.raises(ValidationError, match="Invalid field in format string"):
+        Config(run_id="{missing}")